@@ -1,13 +1,13 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from pydantic import BaseModel, HttpUrl
 from typing import List, Optional, Dict
 import asyncio
 import uuid
 from datetime import datetime
 import redis
-import json
+import orjson
 from ..crawler.intelligent_crawler import IntelligentCrawler
 from ..processor.multimodal_parser import MultimodalParser
 from ..processor.knowledge_builder import KnowledgeBuilder
@@ -25,7 +25,8 @@ app = FastAPI(
     title="AI Customer Service Chatbot API",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration
@@ -119,7 +120,7 @@ async def start_crawl(
     redis_client.setex(
         f"crawl:job:{job_id}",
         3600,  # 1 hour TTL
-        json.dumps({
+        orjson.dumps({
             "status": "started",
             "domain": request.domain,
             "started_at": datetime.utcnow().isoformat(),
@@ -149,7 +150,8 @@ async def get_crawl_status(job_id: str):
     if not job_data:
         raise HTTPException(status_code=404, detail="Job not found")
         
-    return json.loads(job_data)
+    # Already JSON - pass the stored document through without re-encoding
+    return Response(content=job_data, media_type="application/json")
 
 # Chat endpoint
 @app.post("/api/chat", response_model=ChatResponse)
@@ -161,7 +163,7 @@ async def chat(request: ChatRequest):
     # Get session data
     session_data = redis_client.get(f"session:{session_id}")
     if session_data:
-        session = json.loads(session_data)
+        session = orjson.loads(session_data)
     else:
         session = {
             "id": session_id,
@@ -213,7 +215,7 @@ async def chat(request: ChatRequest):
     redis_client.setex(
         f"session:{session_id}",
         18000,
-        json.dumps(session)
+        orjson.dumps(session)
     )
     
     return ChatResponse(
@@ -237,10 +239,13 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
             job_data = redis_client.get(f"crawl:job:{job_id}")
             
             if job_data:
-                await websocket.send_json(json.loads(job_data))
+                # Forward the stored JSON as-is and parse it once for the status check
+                data = orjson.loads(job_data)
+                await websocket.send_text(
+                    job_data if isinstance(job_data, str) else job_data.decode()
+                )
                 
                 # Check if complete
-                data = json.loads(job_data)
                 if data["status"] in ["completed", "failed"]:
                     break
                     
@@ -306,7 +311,7 @@ def update_job_status(job_id: str, status: str, data: Dict):
     """Update job status in Redis"""
     current = redis_client.get(f"crawl:job:{job_id}")
     if current:
-        job_data = json.loads(current)
+        job_data = orjson.loads(current)
     else:
         job_data = {}
         
@@ -317,7 +322,7 @@ def update_job_status(job_id: str, status: str, data: Dict):
     redis_client.setex(
         f"crawl:job:{job_id}",
         3600,
-        json.dumps(job_data)
+        orjson.dumps(job_data)
     )
 
 if __name__ == "__main__":
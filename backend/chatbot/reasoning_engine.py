@@ -1,5 +1,6 @@
+import asyncio
 import torch
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
 import json
 import re
@@ -13,6 +14,31 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Question classes for the response builders, matched as substrings like the
+# keyword lists they replace
+OVERVIEW_QUESTION_RE = re.compile('what|about|describe')
+OVERVIEW_SUBJECT_RE = re.compile('website|business|company')
+# Where a streamed answer is split into chunks
+SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Replies when retrieval finds nothing, checked in order
+HELPFUL_RESPONSES = [
+    (re.compile('hours|open|close|when'), "I don't have our hours information available at the moment. This information might be on our hours or contact page, or you could call us directly for current hours."),
+    (re.compile('menu|food|dishes|eat'), "I don't have our menu details available right now. You might find this on our menu page, or I'd be happy to help you with other information about our business."),
+    (re.compile('price|cost|how much|fee'), "I don't have specific pricing information available. For current prices, please check our pricing page or contact us directly."),
+    (re.compile('service|offer|provide|what do you'), "I don't have detailed information about our specific services right now. Would you like me to help you find our services page or contact information so you can get the details you need?"),
+]
+
+
+async def stream_sentences(answer: str) -> AsyncIterator[str]:
+    """Yield a finished answer sentence by sentence"""
+    for sentence in SENTENCE_BREAK_RE.split(answer):
+        if sentence:
+            yield sentence + ' '
+            # Let the event loop flush each chunk to the client
+            await asyncio.sleep(0)
+
+
 @dataclass
 class ReasoningResponse:
     answer: str
@@ -109,18 +135,18 @@ class ReasoningEngine:
         # Extract actual content from retrieved information
         relevant_content = []
         sources = []
+        seen_sources = set()
         
         for info in retrieved_info:
-            if info.content and len(info.content.strip()) > 10:
-                relevant_content.append(info.content.strip())
+            content = info.content.strip() if info.content else ''
+            if len(content) > 10:
+                relevant_content.append(content)
                 # Only add source if we're actually using this content
                 if info.metadata and info.metadata.get('url'):
-                    source = {
-                        'url': info.metadata['url'],
-                        'title': info.metadata.get('title', 'Source')
-                    }
-                    if source not in sources:
-                        sources.append(source)
+                    key = (info.metadata['url'], info.metadata.get('title', 'Source'))
+                    if key not in seen_sources:
+                        seen_sources.add(key)
+                        sources.append({'url': key[0], 'title': key[1]})
         
         # Generate response based on what we found
         if relevant_content:
@@ -145,6 +171,25 @@ class ReasoningEngine:
             processing_time=time.time() - start_time
         )
     
+    async def answer_question_stream(
+        self,
+        question: str,
+        context: str,
+        retriever: OptimizedRetriever,
+        conversation_history: List[Dict] = []
+    ) -> AsyncIterator[Union[str, ReasoningResponse]]:
+        """
+        Stream the answer sentence by sentence, then yield the full ReasoningResponse
+        """
+        response = await self.answer_question(
+            question, context, retriever, conversation_history
+        )
+        
+        async for sentence in stream_sentences(response.answer):
+            yield sentence
+        
+        yield response
+    
     def _generate_knowledgeable_response(self, question: str, content_pieces: List[str], context: str) -> str:
         """Generate response using actual knowledge like an employee would"""
         question_lower = question.lower()
@@ -152,44 +197,15 @@ class ReasoningEngine:
         # Combine relevant content
         combined_content = " ".join(content_pieces[:3])  # Use top 3 most relevant pieces
         
-        # Different response patterns based on question type
-        if any(word in question_lower for word in ['what', 'about', 'tell me about', 'describe']):
-            # General information questions
-            if 'website' in question_lower or 'business' in question_lower or 'company' in question_lower:
-                # They want overview
-                response = f"{combined_content}"
-                if len(content_pieces) > 3:
-                    response += " I'd be happy to tell you more about any specific aspect that interests you."
-            else:
-                response = f"{combined_content}"
-        
-        elif any(word in question_lower for word in ['when', 'hours', 'open', 'close']):
-            # Hours/timing questions
-            response = f"{combined_content}"
-            
-        elif any(word in question_lower for word in ['where', 'location', 'address', 'find']):
-            # Location questions
-            response = f"{combined_content}"
-            
-        elif any(word in question_lower for word in ['how much', 'price', 'cost', 'fee']):
-            # Pricing questions
-            response = f"{combined_content}"
-            
-        elif any(word in question_lower for word in ['menu', 'options', 'choices', 'selection']):
-            # Menu/options questions
-            response = f"{combined_content}"
-            
-        elif any(word in question_lower for word in ['contact', 'phone', 'email', 'reach']):
-            # Contact questions
-            response = f"{combined_content}"
-            
-        elif any(word in question_lower for word in ['service', 'offer', 'provide', 'do']):
-            # Services questions
-            response = f"{combined_content}"
-            
-        else:
-            # Default pattern
-            response = f"{combined_content}"
+        # Every question type answers with the content itself; overview
+        # questions about the business also offer to go into more detail
+        response = combined_content
+        if (
+            OVERVIEW_QUESTION_RE.search(question_lower)
+            and OVERVIEW_SUBJECT_RE.search(question_lower)
+            and len(content_pieces) > 3
+        ):
+            response += " I'd be happy to tell you more about any specific aspect that interests you."
         
         return response
     
@@ -198,21 +214,12 @@ class ReasoningEngine:
         question_lower = question.lower()
         
         # Check what they're asking about
-        if any(word in question_lower for word in ['hours', 'open', 'close', 'when']):
-            return "I don't have our hours information available at the moment. This information might be on our hours or contact page, or you could call us directly for current hours."
-            
-        elif any(word in question_lower for word in ['menu', 'food', 'dishes', 'eat']):
-            return "I don't have our menu details available right now. You might find this on our menu page, or I'd be happy to help you with other information about our business."
+        for pattern, reply in HELPFUL_RESPONSES:
+            if pattern.search(question_lower):
+                return reply
             
-        elif any(word in question_lower for word in ['price', 'cost', 'how much', 'fee']):
-            return "I don't have specific pricing information available. For current prices, please check our pricing page or contact us directly."
-            
-        elif any(word in question_lower for word in ['service', 'offer', 'provide', 'what do you']):
-            return f"I don't have detailed information about our specific services right now. Would you like me to help you find our services page or contact information so you can get the details you need?"
-            
-        else:
-            # Generic helpful response
-            return f"I don't have specific information about that right now. Is there something else about {context} I can help you with? I can provide information about our business, location, contact details, or other general information."
+        # Generic helpful response
+        return f"I don't have specific information about that right now. Is there something else about {context} I can help you with? I can provide information about our business, location, contact details, or other general information."
     
     def _generate_cache_key(self, question: str, context: str) -> str:
         """Generate cache key for response"""
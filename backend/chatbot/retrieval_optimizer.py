@@ -1,9 +1,11 @@
+import asyncio
+import threading
 import numpy as np
 from typing import List, Dict, Tuple, Optional
-from sentence_transformers import SentenceTransformer
+from cachetools import TTLCache
+from sentence_transformers import CrossEncoder
 import torch
-from rank_bm25 import BM25Okapi
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 import re
 from dataclasses import dataclass
 import logging
@@ -21,6 +23,159 @@ except:
 
 logger = logging.getLogger(__name__)
 
+RERANKER_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L-12-v2"
+# Candidates pulled from the index for the cross-encoder to re-score
+RERANK_CANDIDATES = 100
+# Answers to repeated questions are served from memory for a while
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL = 600
+
+# Common expansions based on patterns, compiled once
+QUERY_EXPANSIONS = [
+    (re.compile(pattern), terms)
+    for pattern, terms in {
+        r"\bhours?\b": ["hours", "open", "closed", "schedule", "times"],
+        r"\bpric(e|ing)\b": ["price", "cost", "fee", "charge", "pricing"],
+        r"\breturn": ["return", "refund", "exchange", "policy"],
+        r"\bship": ["ship", "shipping", "delivery", "send"],
+        r"\bcontact\b": ["contact", "phone", "email", "address", "reach"],
+        r"\bservice": ["service", "services", "offer", "provide", "offerings"],
+        r"\bmenu\b": ["menu", "food", "dishes", "cuisine", "items"],
+    }.items()
+]
+
+_reranker: Optional[CrossEncoder] = None
+_reranker_loaded = False
+_reranker_lock = threading.Lock()
+_rerank_batcher: Optional["RerankBatcher"] = None
+
+
+def get_reranker() -> Optional[CrossEncoder]:
+    """Cross-encoder shared by every retriever, loaded on first use"""
+    global _reranker, _reranker_loaded
+    if not _reranker_loaded:
+        with _reranker_lock:
+            if not _reranker_loaded:
+                try:
+                    _reranker = CrossEncoder(RERANKER_MODEL_NAME)
+                except Exception as e:
+                    logger.warning(f"Failed to load reranker model: {e}")
+                _reranker_loaded = True
+    return _reranker
+
+
+class RerankBatcher:
+    """
+    Coalesces cross-encoder scoring from concurrent requests into a single
+    predict() call, waiting at most max_wait seconds for a batch to fill
+    """
+
+    def __init__(
+        self, reranker: CrossEncoder, max_wait: float = 0.005, max_pairs: int = 512
+    ):
+        self.reranker = reranker
+        self.max_wait = max_wait
+        self.max_pairs = max_pairs
+        self.queue: List[Tuple[List[List[str]], asyncio.Future]] = []
+        self.task: Optional[asyncio.Task] = None
+
+    async def score(self, pairs: List[List[str]]) -> np.ndarray:
+        """Score (query, passage) pairs, sharing predict() with other requests"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.append((pairs, future))
+        if self.task is None or self.task.done():
+            self.task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        if sum(len(pairs) for pairs, _ in self.queue) < self.max_pairs:
+            await asyncio.sleep(self.max_wait)
+        while self.queue:
+            batch = [self.queue.pop(0)]
+            size = len(batch[0][0])
+            while self.queue and size + len(self.queue[0][0]) <= self.max_pairs:
+                batch.append(self.queue.pop(0))
+                size += len(batch[-1][0])
+            try:
+                scores = await asyncio.to_thread(
+                    self._predict, [pair for pairs, _ in batch for pair in pairs]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            offset = 0
+            for pairs, future in batch:
+                if not future.done():
+                    future.set_result(scores[offset : offset + len(pairs)])
+                offset += len(pairs)
+
+    def _predict(self, pairs: List[List[str]]) -> np.ndarray:
+        # No autograd bookkeeping. No BF16 autocast: predict() converts the
+        # logits to numpy, which has no bfloat16
+        with torch.inference_mode():
+            return self.reranker.predict(pairs, batch_size=32)
+
+
+def get_rerank_batcher() -> Optional[RerankBatcher]:
+    """Batcher around the shared cross-encoder, or None if it failed to load"""
+    global _rerank_batcher
+    if _rerank_batcher is None:
+        reranker = get_reranker()
+        if reranker is not None:
+            _rerank_batcher = RerankBatcher(reranker)
+    return _rerank_batcher
+
+
+class SparseBM25:
+    """
+    Okapi BM25 with every document's term weights precomputed into a sparse
+    matrix. It is stored column-major, so each term's column is its posting
+    list and a query only touches documents that contain one of its terms
+    """
+
+    def __init__(
+        self,
+        documents: List[str],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ):
+        vectorizer = CountVectorizer(analyzer=str.split)
+        tf = vectorizer.fit_transform(doc.lower() for doc in documents).tocsr()
+        tf = tf.astype(np.float32)
+        self.vocabulary = vectorizer.vocabulary_
+
+        doc_len = np.asarray(tf.sum(axis=1)).ravel()
+        avgdl = doc_len.mean() or 1.0
+        df = np.bincount(tf.indices, minlength=tf.shape[1])
+        n_docs = tf.shape[0]
+
+        # Same IDF floor as rank_bm25: common terms get epsilon * mean idf
+        idf = np.log((n_docs - df + 0.5) / (df + 0.5))
+        idf[idf < 0] = epsilon * idf.mean()
+
+        rows = np.repeat(np.arange(n_docs), np.diff(tf.indptr))
+        freq = tf.data
+        norm = k1 * (1 - b + b * doc_len[rows] / avgdl)
+        tf.data = (idf[tf.indices] * freq * (k1 + 1) / (freq + norm)).astype(
+            np.float32
+        )
+        self.postings = tf.tocsc()
+
+    def search(self, query_tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and BM25 scores of the documents matching any query term"""
+        cols = [self.vocabulary[t] for t in query_tokens if t in self.vocabulary]
+        if not cols:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+        # Repeated query terms repeat their column, as in rank_bm25
+        postings = self.postings[:, cols]
+        docs, inverse = np.unique(postings.indices, return_inverse=True)
+        return docs, np.bincount(inverse, weights=postings.data)
+
 
 @dataclass
 class RetrievalResult:
@@ -56,11 +211,7 @@ class OptimizedRetriever:
     def _initialize_components(self):
         """Initialize retrieval components with error handling"""
         # Cross-encoder for re-ranking
-        try:
-            self.reranker = SentenceTransformer("cross-encoder/ms-marco-MiniLM-L-6-v2")
-        except Exception as e:
-            logger.warning(f"Failed to load reranker model: {e}")
-            self.reranker = None
+        self.reranker = get_reranker()
 
         # BM25 for keyword search
         try:
@@ -72,6 +223,9 @@ class OptimizedRetriever:
         # Query expansion model
         self.query_expander = None  # Simplified for now
 
+        # Recent results keyed on the normalized query
+        self._result_cache = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
     def _initialize_bm25(self):
         """
         Initialize BM25 for hybrid search
@@ -88,9 +242,7 @@ class OptimizedRetriever:
                 self.doc_metadatas = []
                 return
 
-            # Tokenize for BM25
-            tokenized_docs = [doc.lower().split() for doc in all_docs["documents"]]
-            self.bm25 = BM25Okapi(tokenized_docs)
+            self.bm25 = SparseBM25(all_docs["documents"])
             self.doc_ids = all_docs["ids"]
             self.doc_contents = all_docs["documents"]
             self.doc_metadatas = (
@@ -112,29 +264,44 @@ class OptimizedRetriever:
         """
         Advanced retrieval with multiple strategies
         """
+        cache_key = (
+            " ".join(query.lower().split()),
+            context.get("page_type"),
+            top_k,
+            rerank,
+        )
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         try:
             # 1. Query expansion
             expanded_queries = self._expand_query(query, context)
 
-            # 2. Hybrid search (semantic + keyword)
-            semantic_results = await self._semantic_search(expanded_queries, top_k * 2)
-            keyword_results = (
-                self._keyword_search(query, top_k * 2) if self.bm25 else []
-            )
+            # 2. Hybrid search (semantic + keyword); a wide candidate pool
+            # when the cross-encoder will narrow it down
+            use_reranker = rerank and self.reranker is not None
+            pool = max(top_k * 2, RERANK_CANDIDATES) if use_reranker else top_k * 2
+            semantic_results = await self._semantic_search(expanded_queries, pool)
+            keyword_results = self._keyword_search(query, pool) if self.bm25 else []
 
             # 3. Merge results
             merged_results = self._merge_results(semantic_results, keyword_results)
 
             # 4. Re-rank if enabled and reranker available
-            if rerank and self.reranker and merged_results:
-                reranked_results = self._rerank_results(query, merged_results)
+            if use_reranker and merged_results:
+                reranked_results = await self._rerank_results(
+                    query, merged_results[:pool]
+                )
             else:
                 reranked_results = merged_results
 
             # 5. Post-process and format
             final_results = self._format_results(reranked_results[:top_k])
 
-            return final_results
+            if final_results:
+                self._result_cache[cache_key] = final_results
+            return list(final_results)
 
         except Exception as e:
             logger.error(f"Retrieval error: {e}")
@@ -150,20 +317,9 @@ class OptimizedRetriever:
         if context.get("page_type"):
             expanded.append(f"{query} {context['page_type']}")
 
-        # Common expansions based on patterns
-        expansions = {
-            r"\bhours?\b": ["hours", "open", "closed", "schedule", "times"],
-            r"\bpric(e|ing)\b": ["price", "cost", "fee", "charge", "pricing"],
-            r"\breturn": ["return", "refund", "exchange", "policy"],
-            r"\bship": ["ship", "shipping", "delivery", "send"],
-            r"\bcontact\b": ["contact", "phone", "email", "address", "reach"],
-            r"\bservice": ["service", "services", "offer", "provide", "offerings"],
-            r"\bmenu\b": ["menu", "food", "dishes", "cuisine", "items"],
-        }
-
         query_lower = query.lower()
-        for pattern, terms in expansions.items():
-            if re.search(pattern, query_lower):
+        for pattern, terms in QUERY_EXPANSIONS:
+            if pattern.search(query_lower):
                 for term in terms:
                     expanded.append(f"{query} {term}")
 
@@ -178,32 +334,31 @@ class OptimizedRetriever:
         all_results = []
 
         try:
-            for query in queries:
-                results = self.collection.query(
-                    query_texts=[query],
-                    n_results=min(top_k, self.collection.count()),
-                    include=["documents", "metadatas", "distances"],
-                )
+            # Embeddings are batched with queries from concurrent requests
+            query_embeddings = await chroma_manager.get_embed_batcher().embed(queries)
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=min(top_k, self.collection.count()),
+                include=["documents", "metadatas", "distances"],
+            )
 
-                if results and results["ids"] and results["ids"][0]:
-                    for i in range(len(results["ids"][0])):
-                        content = (
-                            results["documents"][0][i] if results["documents"] else ""
-                        )
-                        metadata = (
-                            results["metadatas"][0][i] if results["metadatas"] else {}
-                        )
-                        distance = (
-                            results["distances"][0][i] if results["distances"] else 1.0
-                        )
+            for q in range(len(results["ids"]) if results else 0):
+                for i in range(len(results["ids"][q])):
+                    content = results["documents"][q][i] if results["documents"] else ""
+                    metadata = (
+                        results["metadatas"][q][i] if results["metadatas"] else {}
+                    )
+                    distance = (
+                        results["distances"][q][i] if results["distances"] else 1.0
+                    )
 
-                        all_results.append(
-                            (
-                                content,
-                                metadata,
-                                1.0 - distance,  # Convert distance to similarity
-                            )
+                    all_results.append(
+                        (
+                            content,
+                            metadata,
+                            1.0 - distance,  # Convert distance to similarity
                         )
+                    )
 
         except Exception as e:
             logger.error(f"Semantic search error: {e}")
@@ -226,15 +381,20 @@ class OptimizedRetriever:
             return []
 
         try:
-            query_tokens = query.lower().split()
-            scores = self.bm25.get_scores(query_tokens)
+            docs, scores = self.bm25.search(query.lower().split())
 
-            # Get top k indices
-            top_indices = np.argsort(scores)[::-1][:top_k]
+            # Get top k candidates: partition first, sort only those k
+            top = np.arange(len(scores))
+            if len(scores) > top_k:
+                top = np.argpartition(-scores, top_k)[:top_k]
+            top = top[np.argsort(-scores[top])]
+            # Scale to [0, 1] so BM25 is comparable with cosine similarity
+            best = scores[top[0]] if len(top) else 0.0
 
             results = []
-            for idx in top_indices:
-                if idx < len(self.doc_contents) and scores[idx] > 0:
+            for i in top:
+                idx = docs[i]
+                if idx < len(self.doc_contents) and scores[i] > 0:
                     content = self.doc_contents[idx]
                     metadata = (
                         self.doc_metadatas[idx] if idx < len(self.doc_metadatas) else {}
@@ -243,7 +403,7 @@ class OptimizedRetriever:
                         (
                             content,
                             metadata,
-                            float(scores[idx]) / 10,  # Normalize BM25 scores
+                            float(scores[i] / best),
                         )
                     )
 
@@ -293,11 +453,12 @@ class OptimizedRetriever:
 
         return [(r["content"], r["metadata"], r["score"]) for r in sorted_results]
 
-    def _rerank_results(self, query: str, results: List[Tuple]) -> List[Tuple]:
+    async def _rerank_results(self, query: str, results: List[Tuple]) -> List[Tuple]:
         """
         Re-rank using cross-encoder
         """
-        if not results or not self.reranker:
+        batcher = get_rerank_batcher()
+        if not results or not batcher:
             return results
 
         try:
@@ -307,9 +468,8 @@ class OptimizedRetriever:
             if not pairs:
                 return results
 
-            # Get similarity scores
-            with torch.no_grad():
-                scores = self.reranker.predict(pairs)
+            # Get similarity scores, batched with concurrent requests
+            scores = await batcher.score(pairs)
 
             # Combine with original scores (0.5 weight each)
             reranked = []
@@ -1,22 +1,106 @@
 """
 Centralized ChromaDB Manager to prevent instance conflicts
 """
+import asyncio
 import chromadb
-from chromadb.utils import embedding_functions
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from sentence_transformers import SentenceTransformer
+import torch
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 import threading
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL_NAME = "BAAI/bge-large-en-v1.5"
+
+# HNSW settings for every collection: a denser graph (M, construction_ef) for
+# recall, and large write batches so bulk adds don't rebuild the index often
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+    "hnsw:batch_size": 1000,
+    "hnsw:sync_threshold": 2000,
+}
+
+
+class SharedEmbeddingFunction(EmbeddingFunction):
+    """
+    Chroma embedding function backed by an already loaded SentenceTransformer,
+    so collections and the knowledge builder share one copy of the model
+    """
+
+    def __init__(self, model: SentenceTransformer):
+        self.model = model
+
+    def __call__(self, input: Documents) -> Embeddings:
+        with torch.inference_mode():
+            return self.model.encode(list(input), batch_size=64).tolist()
+
+
+class EmbedBatcher:
+    """
+    Coalesces query embeddings from concurrent requests into a single encode()
+    call, waiting at most max_wait seconds for a batch to fill
+    """
+
+    def __init__(
+        self,
+        embedding_function: EmbeddingFunction,
+        max_wait: float = 0.005,
+        max_batch: int = 32,
+    ):
+        self.embedding_function = embedding_function
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.queue: List[Tuple[str, asyncio.Future]] = []
+        self.task: Optional[asyncio.Task] = None
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, sharing the encoder call with other pending queries"""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self.queue.append((text, future))
+            futures.append(future)
+        if self.task is None or self.task.done():
+            self.task = loop.create_task(self._flush())
+        return list(await asyncio.gather(*futures))
+
+    async def _flush(self):
+        if len(self.queue) < self.max_batch:
+            await asyncio.sleep(self.max_wait)
+        while self.queue:
+            batch = self.queue[: self.max_batch]
+            del self.queue[: self.max_batch]
+            try:
+                embeddings = await asyncio.to_thread(
+                    self.embedding_function, [text for text, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
 class ChromaDBManager:
     """
     Singleton manager for ChromaDB to ensure consistent settings across all components
     """
     _instance = None
     _lock = threading.Lock()
+    _model_lock = threading.Lock()
     _client = None
+    _embedding_model = None
     _embedding_function = None
+    _embed_batcher = None
     _collections_cache = {}
     
     def __new__(cls):
@@ -40,8 +124,8 @@ class ChromaDBManager:
             )
             
             # Initialize embedding function once
-            self._embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name="BAAI/bge-large-en-v1.5"
+            self._embedding_function = SharedEmbeddingFunction(
+                self.get_embedding_model()
             )
             
             logger.info("ChromaDB client initialized successfully")
@@ -56,14 +140,46 @@ class ChromaDBManager:
             self._initialize_client()
         return self._client
     
+    def get_embedding_model(self) -> SentenceTransformer:
+        """Get the process-wide embedding model, loading it on first use"""
+        if self._embedding_model is None:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    ChromaDBManager._embedding_model = self._load_embedding_model()
+        return self._embedding_model
+    
+    @staticmethod
+    def _load_embedding_model() -> SentenceTransformer:
+        """Load the encoder in FP16 on GPU or with int8 dynamic quantization on CPU"""
+        model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        model.eval()
+        if torch.cuda.is_available():
+            model.half()
+            logger.info("Embedding model running in FP16 on GPU")
+        else:
+            # Only the encoder weights are quantized - Chroma still stores FP32
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info("Embedding model running with int8 dynamic quantization")
+        return model
+    
     def get_embedding_function(self):
         """Get the consistent embedding function"""
         if self._embedding_function is None:
-            self._embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name="BAAI/bge-large-en-v1.5"
+            self._embedding_function = SharedEmbeddingFunction(
+                self.get_embedding_model()
             )
         return self._embedding_function
     
+    def get_embed_batcher(self) -> EmbedBatcher:
+        """Get the shared micro-batcher for query embeddings"""
+        if self._embed_batcher is None:
+            ChromaDBManager._embed_batcher = EmbedBatcher(
+                self.get_embedding_function()
+            )
+        return self._embed_batcher
+    
     def create_collection(self, name: str, metadata: Optional[Dict] = None):
         """Create a new collection with consistent settings"""
         try:
@@ -80,7 +196,7 @@ class ChromaDBManager:
             collection = client.create_collection(
                 name=name,
                 embedding_function=self.get_embedding_function(),
-                metadata=metadata or {"hnsw:space": "cosine"}
+                metadata={**HNSW_METADATA, **(metadata or {})}
             )
             
             # Cache it
@@ -124,6 +240,12 @@ class ChromaDBManager:
             logger.error(f"Failed to get collection {name}: {e}")
             raise
     
+    def delete_collection(self, name: str):
+        """Delete a collection and forget its cached handle"""
+        self._collections_cache.pop(name, None)
+        self.get_client().delete_collection(name)
+        logger.info(f"Deleted collection: {name}")
+    
     def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None):
         """Get existing collection or create if doesn't exist"""
         try:
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List
+import logging
+
+from playwright.async_api import Browser, BrowserContext, Playwright
+
+logger = logging.getLogger(__name__)
+
+# --no-sandbox/--disable-setuid-sandbox (and --single-process, which implies
+# no site isolation) are deliberately left out: these browsers load arbitrary
+# sites
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+]
+
+
+@dataclass
+class BrowserInstance:
+    browser: Browser
+    created_at: float = field(default_factory=time.monotonic)
+    pages_processed: int = 0
+    active_contexts: int = 0
+
+
+class BrowserPool:
+    """
+    A few Chromium instances handed out as fresh contexts. A browser that has
+    served max_pages_per_browser contexts or lived max_age_seconds is replaced,
+    and closed once its last context is released, so long crawls don't keep
+    accumulating renderer memory.
+    """
+
+    def __init__(
+        self,
+        playwright: Playwright,
+        size: int = 1,
+        max_pages_per_browser: int = 50,
+        max_age_seconds: float = 300.0,
+        launch_args: List[str] = LAUNCH_ARGS,
+    ):
+        self.playwright = playwright
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_age_seconds = max_age_seconds
+        self.launch_args = launch_args
+
+        self._pool: List[BrowserInstance] = []
+        self._retiring: List[BrowserInstance] = []
+        self._next = 0
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        """Launch the initial browsers"""
+        for _ in range(self.size):
+            self._pool.append(await self._launch())
+
+    async def _launch(self) -> BrowserInstance:
+        browser = await self.playwright.chromium.launch(
+            headless=True, args=self.launch_args  # HEADLESS MODE
+        )
+        return BrowserInstance(browser)
+
+    def _expired(self, instance: BrowserInstance) -> bool:
+        return (
+            instance.pages_processed >= self.max_pages_per_browser
+            or time.monotonic() - instance.created_at >= self.max_age_seconds
+        )
+
+    async def _checkout(self) -> BrowserInstance:
+        """Pick the next browser round-robin, recycling it if it is worn out"""
+        async with self._lock:
+            slot = self._next % len(self._pool)
+            self._next += 1
+            instance = self._pool[slot]
+
+            if self._expired(instance):
+                logger.info(
+                    f"Recycling browser after {instance.pages_processed} pages"
+                )
+                self._retiring.append(instance)
+                instance = self._pool[slot] = await self._launch()
+                await self._close_idle_retired()
+
+            instance.active_contexts += 1
+            return instance
+
+    async def _release(self, instance: BrowserInstance):
+        async with self._lock:
+            instance.active_contexts -= 1
+            instance.pages_processed += 1
+            await self._close_idle_retired()
+
+    async def _close_idle_retired(self):
+        """Close replaced browsers that no longer have open contexts"""
+        for instance in [r for r in self._retiring if r.active_contexts == 0]:
+            self._retiring.remove(instance)
+            try:
+                await instance.browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing retired browser: {e}")
+
+    @asynccontextmanager
+    async def acquire(self, **context_options) -> AsyncIterator[BrowserContext]:
+        """Yield a new browser context, closed and accounted for on exit"""
+        instance = await self._checkout()
+        try:
+            context = await instance.browser.new_context(**context_options)
+            try:
+                yield context
+            finally:
+                await context.close()
+        finally:
+            await self._release(instance)
+
+    async def close(self):
+        """Close every browser, including ones still being retired"""
+        async with self._lock:
+            for instance in self._pool + self._retiring:
+                try:
+                    await instance.browser.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser: {e}")
+            self._pool.clear()
+            self._retiring.clear()
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Set, List
+from typing import Set, List, Optional
 import aiohttp
 from urllib.parse import urljoin, urlparse
 import xml.etree.ElementTree as ET
@@ -13,6 +13,29 @@ class DiscoveryStrategies:
     def __init__(self, domain: str):
         self.domain = domain
         self.base_url = f"https://{domain}"
+        # One keep-alive pool for every sitemap/robots fetch against the domain
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use inside the loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=10,
+                    limit_per_host=10,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30,
+                    enable_cleanup_closed=True,
+                ),
+                timeout=aiohttp.ClientTimeout(total=20),
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def discover_from_sitemap(self) -> Set[str]:
         """Discover URLs from sitemap.xml"""
@@ -24,35 +47,35 @@ class DiscoveryStrategies:
             f"{self.base_url}/sitemap_index.xml.gz",
         ]
 
-        async with aiohttp.ClientSession() as session:
-            for sitemap_url in sitemap_urls:
-                try:
-                    async with session.get(sitemap_url, timeout=10) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            discovered = self._parse_sitemap(content)
-                            urls.update(discovered)
-
-                            # If it's a sitemap index, fetch child sitemaps
-                            if "sitemapindex" in content:
-                                child_sitemaps = self._extract_sitemap_urls(content)
-                                for child_url in child_sitemaps:
-                                    try:
-                                        async with session.get(
-                                            child_url, timeout=10
-                                        ) as child_response:
-                                            if child_response.status == 200:
-                                                child_content = (
-                                                    await child_response.text()
-                                                )
-                                                urls.update(
-                                                    self._parse_sitemap(child_content)
-                                                )
-                                    except:
-                                        pass
-                            break
-                except Exception as e:
-                    logger.debug(f"Sitemap not found at {sitemap_url}: {e}")
+        session = self._get_session()
+        for sitemap_url in sitemap_urls:
+            try:
+                async with session.get(sitemap_url, timeout=10) as response:
+                    if response.status == 200:
+                        content = await response.text()
+                        discovered = self._parse_sitemap(content)
+                        urls.update(discovered)
+
+                        # If it's a sitemap index, fetch child sitemaps
+                        if "sitemapindex" in content:
+                            child_sitemaps = self._extract_sitemap_urls(content)
+                            for child_url in child_sitemaps:
+                                try:
+                                    async with session.get(
+                                        child_url, timeout=10
+                                    ) as child_response:
+                                        if child_response.status == 200:
+                                            child_content = (
+                                                await child_response.text()
+                                            )
+                                            urls.update(
+                                                self._parse_sitemap(child_content)
+                                            )
+                                except:
+                                    pass
+                        break
+            except Exception as e:
+                logger.debug(f"Sitemap not found at {sitemap_url}: {e}")
 
         return urls
 
@@ -61,25 +84,25 @@ class DiscoveryStrategies:
         urls = set()
         robots_url = f"{self.base_url}/robots.txt"
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(robots_url, timeout=10) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        for line in content.split("\n"):
-                            line = line.strip()
-                            if line.startswith("Sitemap:"):
-                                sitemap_url = line.split(":", 1)[1].strip()
-                                urls.add(sitemap_url)
-                            elif line.startswith("Allow:") or line.startswith(
-                                "Disallow:"
-                            ):
-                                path = line.split(":", 1)[1].strip()
-                                if path and path != "/" and not path.startswith("*"):
-                                    full_url = urljoin(self.base_url, path)
-                                    urls.add(full_url)
-            except Exception as e:
-                logger.debug(f"Robots.txt not found: {e}")
+        session = self._get_session()
+        try:
+            async with session.get(robots_url, timeout=10) as response:
+                if response.status == 200:
+                    content = await response.text()
+                    for line in content.split("\n"):
+                        line = line.strip()
+                        if line.startswith("Sitemap:"):
+                            sitemap_url = line.split(":", 1)[1].strip()
+                            urls.add(sitemap_url)
+                        elif line.startswith("Allow:") or line.startswith(
+                            "Disallow:"
+                        ):
+                            path = line.split(":", 1)[1].strip()
+                            if path and path != "/" and not path.startswith("*"):
+                                full_url = urljoin(self.base_url, path)
+                                urls.add(full_url)
+        except Exception as e:
+            logger.debug(f"Robots.txt not found: {e}")
 
         return urls
 
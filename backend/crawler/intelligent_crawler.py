@@ -1,5 +1,7 @@
 import asyncio
-from typing import List, Dict, Set, Optional, Tuple
+import functools
+import os
+from typing import AsyncIterator, List, Dict, Set, Optional, Tuple
 from urllib.parse import urljoin, urlparse, parse_qs, urlunparse
 import aiohttp
 from bs4 import BeautifulSoup
@@ -11,11 +13,165 @@ import json
 from dataclasses import dataclass, field
 import logging
 from .discovery_strategies import DiscoveryStrategies
+from .browser_pool import BrowserPool
 from playwright.async_api import async_playwright
 
 logger = logging.getLogger(__name__)
 
 
+# Requests the crawler never needs: they cost bandwidth and, for trackers, JS.
+# Stylesheets still load so screenshots and layout stay meaningful.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+)
+
+
+async def _block_unneeded_requests(route):
+    """Context route handler that aborts assets and analytics beacons"""
+    request = route.request
+    host = urlparse(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host == blocked or host.endswith("." + blocked) for blocked in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Everything _crawl_page_complete reads from the DOM, gathered in one evaluate
+PAGE_EXTRACT_JS = """
+() => {
+    const all = (selector, root = document) => Array.from(root.querySelectorAll(selector));
+    const metaContent = (name) => {
+        const el = document.querySelector(`meta[name="${name}"]`);
+        return el ? el.content : undefined;
+    };
+
+    const openGraph = {};
+    all('meta[property^="og:"]').forEach(meta => {
+        openGraph[meta.getAttribute('property')] = meta.getAttribute('content');
+    });
+
+    const metadata = { language: document.documentElement.lang || 'en' };
+    for (const name of ['description', 'keywords', 'author', 'robots']) {
+        const value = metaContent(name);
+        if (value !== undefined) metadata[name] = value;
+    }
+    const canonical = document.querySelector('link[rel="canonical"]');
+    if (canonical) metadata.canonical = canonical.href;
+
+    return {
+        structured_data: {
+            json_ld: all('script[type="application/ld+json"]').map(s => {
+                try {
+                    return JSON.parse(s.textContent);
+                } catch {
+                    return null;
+                }
+            }).filter(Boolean),
+            open_graph: openGraph,
+            microdata: all('[itemscope]').map(item => ({
+                type: item.getAttribute('itemtype'),
+                properties: all('[itemprop]', item).map(prop => ({
+                    name: prop.getAttribute('itemprop'),
+                    content: prop.textContent || prop.getAttribute('content')
+                }))
+            })),
+        },
+        metadata,
+        links: Array.from(new Set(all('a[href]').map(a => a.href))),
+        forms: all('form').map(form => ({
+            action: form.action || '',
+            method: form.method || 'get',
+            id: form.id || '',
+            class: form.className || '',
+            inputs: all('input, select, textarea', form).map(input => ({
+                type: input.type || 'text',
+                name: input.name || '',
+                id: input.id || '',
+                required: input.hasAttribute('required'),
+                placeholder: input.placeholder || ''
+            }))
+        })),
+        media: [
+            ...all('img').map(img => ({
+                type: 'image',
+                src: img.src,
+                alt: img.alt || '',
+                title: img.title || '',
+                width: img.naturalWidth,
+                height: img.naturalHeight
+            })),
+            ...all('video').map(video => ({
+                type: 'video',
+                src: video.src || (video.querySelector('source') ? video.querySelector('source').src : ''),
+                poster: video.poster || ''
+            })),
+        ],
+    };
+}
+"""
+
+
+# Memoized: a URL is normalized when queued and again when a worker dequeues it
+@functools.lru_cache(maxsize=100_000)
+def normalize_url(url: str) -> str:
+    """
+    Normalize URL to prevent duplicates
+    - Remove fragments
+    - Remove trailing slashes
+    - Sort query parameters
+    - Lowercase domain
+    """
+    try:
+        parsed = urlparse(url.lower())
+
+        # Remove trailing slash from path
+        path = parsed.path.rstrip("/")
+        if not path:
+            path = "/"
+
+        # Sort query parameters for consistency
+        query_params = parse_qs(parsed.query)
+        sorted_query = "&".join(
+            [f"{k}={','.join(sorted(v))}" for k, v in sorted(query_params.items())]
+        )
+
+        # Reconstruct URL without fragment
+        normalized = urlunparse(
+            (
+                parsed.scheme,
+                parsed.netloc,
+                path,
+                parsed.params,
+                sorted_query,
+                "",  # No fragment
+            )
+        )
+
+        return normalized
+    except Exception as e:
+        logger.error(f"Error normalizing URL {url}: {e}")
+        return url
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+# Server-rendered pages with at least this much body text skip the browser
+STATIC_MIN_TEXT = 500
+
+
+def _plan_workers(max_pages: int) -> int:
+    """Browser workers for a crawl: scales with max_pages, capped by CPU count"""
+    cpu = os.cpu_count() or 4
+    base = min(10, max(3, max_pages // 5))
+    return max(3, min(base, cpu * 2))
+
+
 @dataclass
 class CrawledPage:
     url: str
@@ -33,6 +189,11 @@ class CrawledPage:
     page_type: str = "general"
     importance_score: float = 1.0
 
+    def release_raw(self):
+        """Drop the raw HTML and screenshots once the page has been processed"""
+        self.html = ""
+        self.screenshots = []
+
 
 class IntelligentCrawler:
     """
@@ -49,8 +210,19 @@ class IntelligentCrawler:
         self.visited_normalized: Set[str] = set()  # Track normalized versions
         self.to_visit: asyncio.PriorityQueue = asyncio.PriorityQueue()
         self.queued_urls: Set[str] = set()  # Track what's already in queue
+        # Raw link strings already considered, so nav/footer links repeated on
+        # every page skip normalization and _should_crawl
+        self.seen_links: Set[str] = set()
         self.pages: List[CrawledPage] = []
         self.failed_urls: Dict[str, str] = {}
+        # Set by stream_pages() so consumers get pages as they are crawled
+        self._page_stream: Optional[asyncio.Queue] = None
+        # Worker count chosen by _crawl_phase, exposed for progress reporting
+        self.num_workers = 0
+        # Recycled Chromium instances shared by all crawl workers
+        self._pool: Optional[BrowserPool] = None
+        # Plain HTTP client for pages that render without JavaScript
+        self._http: Optional[aiohttp.ClientSession] = None
 
         # Discovery strategies
         self.discovery = DiscoveryStrategies(self.domain)
@@ -68,42 +240,9 @@ class IntelligentCrawler:
 
     def _normalize_url(self, url: str) -> str:
         """
-        Normalize URL to prevent duplicates
-        - Remove fragments
-        - Remove trailing slashes
-        - Sort query parameters
-        - Lowercase domain
+        Normalize URL to prevent duplicates (see normalize_url)
         """
-        try:
-            parsed = urlparse(url.lower())
-
-            # Remove trailing slash from path
-            path = parsed.path.rstrip("/")
-            if not path:
-                path = "/"
-
-            # Sort query parameters for consistency
-            query_params = parse_qs(parsed.query)
-            sorted_query = "&".join(
-                [f"{k}={','.join(sorted(v))}" for k, v in sorted(query_params.items())]
-            )
-
-            # Reconstruct URL without fragment
-            normalized = urlunparse(
-                (
-                    parsed.scheme,
-                    parsed.netloc,
-                    path,
-                    parsed.params,
-                    sorted_query,
-                    "",  # No fragment
-                )
-            )
-
-            return normalized
-        except Exception as e:
-            logger.error(f"Error normalizing URL {url}: {e}")
-            return url
+        return normalize_url(url)
 
     async def start(self) -> List[CrawledPage]:
         """
@@ -111,40 +250,94 @@ class IntelligentCrawler:
         """
         logger.info(f"Starting crawl of {self.domain}")
 
-        # Phase 1: Discovery - Find all possible URLs
-        discovered_urls = await self._discovery_phase()
-        logger.info(f"Discovered {len(discovered_urls)} potential URLs")
+        # One Playwright driver and browser pool serve discovery and crawling
+        async with async_playwright() as p:
+            self._pool = BrowserPool(p)
+            try:
+                await self._pool.start()
+
+                # Phase 1: Discovery - Find all possible URLs
+                discovered_urls = await self._discovery_phase()
+                logger.info(f"Discovered {len(discovered_urls)} potential URLs")
 
-        # Phase 2: Prioritization - Sort by importance
-        prioritized_urls = await self._prioritize_urls(discovered_urls)
+                # Phase 2: Prioritization - Sort by importance
+                prioritized_urls = await self._prioritize_urls(discovered_urls)
 
-        # Add to queue with priority, avoiding duplicates
-        for priority, url in prioritized_urls:
-            normalized = self._normalize_url(url)
-            if normalized not in self.queued_urls:
-                await self.to_visit.put((priority, url))
-                self.queued_urls.add(normalized)
+                # Add to queue with priority, avoiding duplicates
+                for priority, url in prioritized_urls:
+                    self.seen_links.add(url)
+                    normalized = self._normalize_url(url)
+                    if normalized not in self.queued_urls:
+                        await self.to_visit.put((priority, url))
+                        self.queued_urls.add(normalized)
 
-        # Phase 3: Crawling - Extract content with visual understanding
-        await self._crawl_phase()
+                # Phase 3: Crawling - Extract content with visual understanding
+                await self._crawl_phase()
+            finally:
+                await self._pool.close()
+                self._pool = None
 
         logger.info(f"Crawl complete. Processed {len(self.pages)} pages")
         return self.pages
 
+    async def stream_pages(
+        self, max_batch: int = 50
+    ) -> AsyncIterator[List[CrawledPage]]:
+        """
+        Run the crawl in the background and yield pages in batches as soon as
+        they are crawled, so processing can overlap with crawling
+        """
+        self._page_stream = asyncio.Queue()
+        crawl_task = asyncio.create_task(self._crawl_to_stream())
+
+        try:
+            while True:
+                page = await self._page_stream.get()
+
+                # Take whatever else is already waiting, up to max_batch
+                batch = []
+                while page is not None:
+                    batch.append(page)
+                    if len(batch) >= max_batch or self._page_stream.empty():
+                        break
+                    page = self._page_stream.get_nowait()
+
+                if batch:
+                    yield batch
+                if page is None:
+                    break
+
+            # Surface any crawl error to the consumer
+            await crawl_task
+        finally:
+            if not crawl_task.done():
+                crawl_task.cancel()
+
+    async def _crawl_to_stream(self):
+        """
+        Run start() and mark the end of the page stream however it finishes
+        """
+        try:
+            await self.start()
+        finally:
+            self._page_stream.put_nowait(None)
+
     async def _discovery_phase(self) -> Set[str]:
         """
         Discover all possible URLs using multiple strategies
         """
         all_urls = set()
 
-        # 1. Standard discovery methods
-        all_urls.update(await self.discovery.discover_from_sitemap())
-        all_urls.update(await self.discovery.discover_from_robots())
+        # 1. Standard discovery methods, sharing one keep-alive HTTP session
+        try:
+            all_urls.update(await self.discovery.discover_from_sitemap())
+            all_urls.update(await self.discovery.discover_from_robots())
+        finally:
+            await self.discovery.aclose()
 
         # 2. Homepage deep scan
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)  # HEADLESS MODE
-            page = await browser.new_page()
+        async with self._pool.acquire() as context:
+            page = await context.new_page()
 
             try:
                 await page.goto(self.base_url, wait_until="networkidle")
@@ -163,8 +356,6 @@ class IntelligentCrawler:
 
             except Exception as e:
                 logger.error(f"Discovery phase error: {e}")
-            finally:
-                await browser.close()
 
         # 3. External discovery
         all_urls.update(await self.discovery.discover_via_search_engines())
@@ -185,91 +376,249 @@ class IntelligentCrawler:
         Main crawling phase with concurrent workers
         """
 
-        # Calculate optimal number of workers
-        num_workers = min(10, max(3, self.max_pages // 5))
+        # Calculate optimal number of workers. Each one exits once the queue is
+        # empty, so don't start more than there are URLs
+        num_workers = max(1, min(_plan_workers(self.max_pages), self.to_visit.qsize()))
+        self.num_workers = num_workers
 
         logger.info(
             f"🚀 Starting {num_workers} crawler workers for {self.max_pages} pages"
         )
 
-        workers = []
-        for i in range(num_workers):
-            workers.append(asyncio.create_task(self._crawler_worker(i)))
+        # Workers share the browser pool from start() and one HTTP session
+        self._http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=num_workers * 2, ttl_dns_cache=300, keepalive_timeout=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=8),
+            headers={"User-Agent": USER_AGENT},
+        )
+        try:
+            # A failing worker cancels its siblings instead of leaving them
+            # orphaned
+            async with asyncio.TaskGroup() as workers:
+                for i in range(num_workers):
+                    workers.create_task(self._crawler_worker(i))
+        finally:
+            await self._http.close()
+            self._http = None
+
+    async def _crawl_static(self, url: str) -> Optional[CrawledPage]:
+        """
+        Fetch a page over plain HTTP and build it from the HTML when it is
+        server-rendered. Returns None when the browser is needed instead.
+        """
+        try:
+            async with self._http.get(url) as response:
+                if response.status != 200 or "html" not in response.content_type:
+                    return None
+                html = await response.text()
+        except Exception as e:
+            logger.debug(f"Static fetch failed for {url}: {e}")
+            return None
 
-        await asyncio.gather(*workers)
+        return await asyncio.to_thread(self._page_from_html, url, html)
 
-    async def _crawler_worker(self, worker_id: int):
+    def _page_from_html(self, url: str, html: str) -> Optional[CrawledPage]:
         """
-        Individual crawler worker with visual understanding
+        Build a CrawledPage from static HTML, or None if it looks like a
+        JavaScript app shell
         """
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,  # HEADLESS MODE
-                args=["--disable-blink-features=AutomationControlled"],
-            )
-
-            context = await browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                device_scale_factor=1.5,
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            )
+        soup = BeautifulSoup(html, "lxml")
+        body = soup.body
+        if body is None:
+            return None
+        for noscript in body.find_all("noscript"):
+            if "javascript" in noscript.get_text().lower():
+                return None
+            noscript.decompose()
+        text = body.get_text(" ", strip=True)
+        if len(text) < STATIC_MIN_TEXT:
+            return None
 
-            page = await context.new_page()
+        crawled_page = CrawledPage(
+            url=url,
+            title=soup.title.get_text(strip=True) if soup.title else "",
+            content="",  # Will be filled by processor
+            html=html,
+        )
 
-            # Enable request interception for efficiency
-            await page.route(
-                "**/*.{png,jpg,jpeg,gif,svg,mp3,mp4,avi,flac,ogg,wav,webm}",
-                lambda route: route.abort(),
+        json_ld = []
+        for script in soup.find_all("script", type="application/ld+json"):
+            try:
+                json_ld.append(json.loads(script.string or ""))
+            except ValueError:
+                pass
+        open_graph = {
+            meta["property"]: meta.get("content")
+            for meta in soup.select('meta[property^="og:"]')
+        }
+        microdata = [
+            {
+                "type": item.get("itemtype"),
+                "properties": [
+                    {
+                        "name": prop.get("itemprop"),
+                        "content": prop.get_text() or prop.get("content"),
+                    }
+                    for prop in item.select("[itemprop]")
+                ],
+            }
+            for item in soup.select("[itemscope]")
+        ]
+        crawled_page.structured_data = {
+            key: value
+            for key, value in (
+                ("json_ld", json_ld),
+                ("open_graph", open_graph),
+                ("microdata", microdata),
             )
+            if value
+        }
 
-            while not self.to_visit.empty() and len(self.visited_urls) < self.max_pages:
-                try:
-                    priority, url = await self.to_visit.get()
-
-                    # Normalize URL
-                    normalized_url = self._normalize_url(url)
-
-                    # Skip if already visited (check both raw and normalized)
-                    if (
-                        url in self.visited_urls
-                        or normalized_url in self.visited_normalized
-                    ):
-                        continue
-
-                    logger.info(f"Worker {worker_id}: Crawling {url}")
-
-                    page_data = await self._crawl_page_complete(page, url)
+        meta_data = {"language": (soup.html.get("lang") if soup.html else None) or "en"}
+        for name in ("description", "keywords", "author", "robots"):
+            tag = soup.find("meta", attrs={"name": name})
+            if tag is not None:
+                meta_data[name] = tag.get("content", "")
+        canonical = soup.find("link", rel="canonical")
+        if canonical is not None and canonical.get("href"):
+            meta_data["canonical"] = urljoin(url, canonical["href"])
+        crawled_page.meta_data = meta_data
+
+        links = dict.fromkeys(
+            urljoin(url, a["href"]) for a in soup.find_all("a", href=True)
+        )
+        crawled_page.links = [link for link in links if self._is_valid_url(link)]
+
+        crawled_page.forms = [
+            {
+                "action": urljoin(url, form.get("action", "")),
+                "method": (form.get("method") or "get").lower(),
+                "id": form.get("id", ""),
+                "class": " ".join(form.get("class", [])),
+                "inputs": [
+                    {
+                        "type": control.get("type", "text"),
+                        "name": control.get("name", ""),
+                        "id": control.get("id", ""),
+                        "required": control.has_attr("required"),
+                        "placeholder": control.get("placeholder", ""),
+                    }
+                    for control in form.find_all(["input", "select", "textarea"])
+                ],
+            }
+            for form in soup.find_all("form")
+        ]
 
-                    if page_data:
-                        self.pages.append(page_data)
-                        self.visited_urls.add(url)
-                        self.visited_normalized.add(normalized_url)
+        media = [
+            {
+                "type": "image",
+                "src": urljoin(url, img.get("src", "")),
+                "alt": img.get("alt", ""),
+                "title": img.get("title", ""),
+                "width": img.get("width", 0),
+                "height": img.get("height", 0),
+            }
+            for img in soup.find_all("img")
+        ]
+        for video in soup.find_all("video"):
+            src = video.get("src")
+            if not src and video.source:
+                src = video.source.get("src", "")
+            media.append(
+                {
+                    "type": "video",
+                    "src": urljoin(url, src) if src else "",
+                    "poster": video.get("poster", ""),
+                }
+            )
+        crawled_page.media = media
 
-                        # Add new URLs to queue
-                        for link in page_data.links:
-                            # Normalize the link
-                            normalized_link = self._normalize_url(link)
+        crawled_page.page_type = self._determine_page_type(url, crawled_page)
+        crawled_page.importance_score = self._calculate_importance(crawled_page)
+        crawled_page.content_hash = hashlib.sha256(html.encode()).hexdigest()
 
-                            # Check if we should crawl it and if it's not already queued
-                            if (
-                                link not in self.visited_urls
-                                and normalized_link not in self.visited_normalized
-                                and normalized_link not in self.queued_urls
-                                and self._should_crawl(link)
-                            ):
+        return crawled_page
 
-                                link_priority = self._calculate_url_priority(link)
-                                await self.to_visit.put((link_priority, link))
-                                self.queued_urls.add(normalized_link)
+    async def _crawl_in_context(self, url: str) -> Optional[CrawledPage]:
+        """
+        Crawl one URL in a fresh context from the browser pool
+        """
+        async with self._pool.acquire(
+            viewport={"width": 1920, "height": 1080},
+            device_scale_factor=1.5,
+            user_agent=USER_AGENT,
+        ) as context:
+            # Enable request interception for efficiency
+            await context.route("**/*", _block_unneeded_requests)
+            page = await context.new_page()
+            return await self._crawl_page_complete(page, url)
 
-                except asyncio.TimeoutError:
-                    logger.error(f"Timeout crawling {url}")
-                    self.failed_urls[url] = "timeout"
-                except Exception as e:
-                    logger.error(f"Error crawling {url}: {e}")
-                    self.failed_urls[url] = str(e)
+    async def _crawler_worker(self, worker_id: int):
+        """
+        Individual crawler worker with visual understanding
+        """
+        while not self.to_visit.empty() and len(self.visited_urls) < self.max_pages:
+            try:
+                # The loop condition just saw an item; take it without
+                # going through the awaitable get()
+                priority, url = self.to_visit.get_nowait()
+
+                # Normalize URL
+                normalized_url = self._normalize_url(url)
+
+                # Skip if already visited (check both raw and normalized)
+                if (
+                    url in self.visited_urls
+                    or normalized_url in self.visited_normalized
+                ):
+                    continue
+
+                logger.info(f"Worker {worker_id}: Crawling {url}")
+
+                # Server-rendered pages don't need a browser at all
+                page_data = await self._crawl_static(url)
+                if page_data is None:
+                    page_data = await self._crawl_in_context(url)
+
+                if page_data:
+                    self.pages.append(page_data)
+                    if self._page_stream is not None:
+                        self._page_stream.put_nowait(page_data)
+                    self._on_page_crawled(page_data)
+                    self.visited_urls.add(url)
+                    self.visited_normalized.add(normalized_url)
+
+                    # Add new URLs to queue
+                    for link in page_data.links:
+                        if link in self.seen_links:
+                            continue
+                        self.seen_links.add(link)
+
+                        # Normalize the link
+                        normalized_link = self._normalize_url(link)
+
+                        # Everything visited was queued first, so this
+                        # also excludes visited pages
+                        if normalized_link not in self.queued_urls and (
+                            self._should_crawl(link)
+                        ):
+                            link_priority = self._calculate_url_priority(link)
+                            await self.to_visit.put((link_priority, link))
+                            self.queued_urls.add(normalized_link)
+
+            except asyncio.TimeoutError:
+                logger.error(f"Timeout crawling {url}")
+                self.failed_urls[url] = "timeout"
+            except Exception as e:
+                logger.error(f"Error crawling {url}: {e}")
+                self.failed_urls[url] = str(e)
 
-            await browser.close()
+    def _on_page_crawled(self, page: CrawledPage):
+        """
+        Hook called once per successfully crawled page
+        """
 
     async def _crawl_page_complete(self, page: Page, url: str) -> Optional[CrawledPage]:
         """
@@ -299,20 +648,19 @@ class IntelligentCrawler:
             # Take screenshots for visual understanding
             crawled_page.screenshots = await self._capture_page_screenshots(page)
 
-            # Extract structured data
-            crawled_page.structured_data = await self._extract_structured_data(page)
-
-            # Extract metadata
-            crawled_page.meta_data = await self._extract_metadata(page)
-
-            # Extract all links
-            crawled_page.links = await self._extract_all_links(page)
-
-            # Extract forms
-            crawled_page.forms = await self._extract_forms(page)
-
-            # Extract media
-            crawled_page.media = await self._extract_media(page)
+            # Structured data, metadata, links, forms and media in one evaluate
+            data = await self._extract_page_data(page)
+            crawled_page.structured_data = {
+                key: value
+                for key, value in data.get("structured_data", {}).items()
+                if value
+            }
+            crawled_page.meta_data = data.get("metadata", {})
+            crawled_page.links = [
+                link for link in data.get("links", []) if self._is_valid_url(link)
+            ]
+            crawled_page.forms = data.get("forms", [])
+            crawled_page.media = data.get("media", [])
 
             # Determine page type
             crawled_page.page_type = self._determine_page_type(url, crawled_page)
@@ -361,213 +709,16 @@ class IntelligentCrawler:
 
         return screenshots
 
-    async def _extract_structured_data(self, page: Page) -> Dict:
+    async def _extract_page_data(self, page: Page) -> Dict:
         """
-        Extract all structured data from the page
+        Extract structured data, metadata, links, forms and media in a single
+        browser round trip
         """
-        structured_data = {}
-
-        try:
-            # JSON-LD
-            json_ld = await page.evaluate(
-                """
-                () => {
-                    const scripts = document.querySelectorAll('script[type="application/ld+json"]');
-                    return Array.from(scripts).map(s => {
-                        try {
-                            return JSON.parse(s.textContent);
-                        } catch {
-                            return null;
-                        }
-                    }).filter(Boolean);
-                }
-            """
-            )
-            if json_ld:
-                structured_data["json_ld"] = json_ld
-
-            # Open Graph
-            og_data = await page.evaluate(
-                """
-                () => {
-                    const metas = document.querySelectorAll('meta[property^="og:"]');
-                    const data = {};
-                    metas.forEach(meta => {
-                        data[meta.getAttribute('property')] = meta.getAttribute('content');
-                    });
-                    return data;
-                }
-            """
-            )
-            if og_data:
-                structured_data["open_graph"] = og_data
-
-            # Microdata
-            microdata = await page.evaluate(
-                """
-                () => {
-                    const items = document.querySelectorAll('[itemscope]');
-                    return Array.from(items).map(item => ({
-                        type: item.getAttribute('itemtype'),
-                        properties: Array.from(item.querySelectorAll('[itemprop]')).map(prop => ({
-                            name: prop.getAttribute('itemprop'),
-                            content: prop.textContent || prop.getAttribute('content')
-                        }))
-                    }));
-                }
-            """
-            )
-            if microdata:
-                structured_data["microdata"] = microdata
-
-        except Exception as e:
-            logger.error(f"Error extracting structured data: {e}")
-
-        return structured_data
-
-    async def _extract_metadata(self, page: Page) -> Dict:
-        """
-        Extract page metadata
-        """
-        metadata = {}
-
         try:
-            metadata = await page.evaluate(
-                """
-                () => {
-                    const meta = {};
-                    
-                    // Basic meta tags
-                    const description = document.querySelector('meta[name="description"]');
-                    if (description) meta.description = description.content;
-                    
-                    const keywords = document.querySelector('meta[name="keywords"]');
-                    if (keywords) meta.keywords = keywords.content;
-                    
-                    const author = document.querySelector('meta[name="author"]');
-                    if (author) meta.author = author.content;
-                    
-                    const robots = document.querySelector('meta[name="robots"]');
-                    if (robots) meta.robots = robots.content;
-                    
-                    // Language
-                    meta.language = document.documentElement.lang || 'en';
-                    
-                    // Canonical URL
-                    const canonical = document.querySelector('link[rel="canonical"]');
-                    if (canonical) meta.canonical = canonical.href;
-                    
-                    return meta;
-                }
-            """
-            )
+            return await page.evaluate(PAGE_EXTRACT_JS)
         except Exception as e:
-            logger.error(f"Error extracting metadata: {e}")
-
-        return metadata
-
-    async def _extract_all_links(self, page: Page) -> List[str]:
-        """
-        Extract all links from the page
-        """
-        links = []
-
-        try:
-            raw_links = await page.evaluate(
-                """
-                () => {
-                    const links = new Set();
-                    document.querySelectorAll('a[href]').forEach(a => {
-                        links.add(a.href);
-                    });
-                    return Array.from(links);
-                }
-            """
-            )
-
-            # Filter and clean links
-            for link in raw_links:
-                if self._is_valid_url(link):
-                    links.append(link)
-
-        except Exception as e:
-            logger.error(f"Error extracting links: {e}")
-
-        return links
-
-    async def _extract_forms(self, page: Page) -> List[Dict]:
-        """
-        Extract form information
-        """
-        forms = []
-
-        try:
-            forms = await page.evaluate(
-                """
-                () => {
-                    return Array.from(document.querySelectorAll('form')).map(form => ({
-                        action: form.action || '',
-                        method: form.method || 'get',
-                        id: form.id || '',
-                        class: form.className || '',
-                        inputs: Array.from(form.querySelectorAll('input, select, textarea')).map(input => ({
-                            type: input.type || 'text',
-                            name: input.name || '',
-                            id: input.id || '',
-                            required: input.hasAttribute('required'),
-                            placeholder: input.placeholder || ''
-                        }))
-                    }));
-                }
-            """
-            )
-        except Exception as e:
-            logger.error(f"Error extracting forms: {e}")
-
-        return forms
-
-    async def _extract_media(self, page: Page) -> List[Dict]:
-        """
-        Extract media elements information
-        """
-        media = []
-
-        try:
-            # Images
-            images = await page.evaluate(
-                """
-                () => {
-                    return Array.from(document.querySelectorAll('img')).map(img => ({
-                        type: 'image',
-                        src: img.src,
-                        alt: img.alt || '',
-                        title: img.title || '',
-                        width: img.naturalWidth,
-                        height: img.naturalHeight
-                    }));
-                }
-            """
-            )
-            media.extend(images)
-
-            # Videos
-            videos = await page.evaluate(
-                """
-                () => {
-                    return Array.from(document.querySelectorAll('video')).map(video => ({
-                        type: 'video',
-                        src: video.src || (video.querySelector('source') ? video.querySelector('source').src : ''),
-                        poster: video.poster || ''
-                    }));
-                }
-            """
-            )
-            media.extend(videos)
-
-        except Exception as e:
-            logger.error(f"Error extracting media: {e}")
-
-        return media
+            logger.error(f"Error extracting page data: {e}")
+            return {}
 
     async def _extract_navigation_links(self, page) -> Set[str]:
         """
@@ -1,9 +1,8 @@
 import asyncio
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import hashlib
 import json
-from sentence_transformers import SentenceTransformer
 import logging
 from ..crawler.intelligent_crawler import CrawledPage
 from .multimodal_parser import MultimodalParser, ProcessedContent
@@ -27,9 +26,15 @@ class KnowledgeBuilder:
     Builds knowledge base from processed content using centralized ChromaDB
     """
 
+    # Chunks embedded and written to Chroma together
+    CHUNK_BATCH = 128
+    # Pages handed to the parser at once
+    PARSE_CONCURRENCY = 8
+
     def __init__(self, multimodal_parser: MultimodalParser):
         self.parser = multimodal_parser
-        self.embedding_model = SentenceTransformer("BAAI/bge-large-en-v1.5")
+        # Shared with the collections' embedding function - loaded only once
+        self.embedding_model = chroma_manager.get_embedding_model()
 
     async def build_knowledge_base(self, domain: str, pages: List[CrawledPage]) -> str:
         """
@@ -37,65 +42,129 @@ class KnowledgeBuilder:
         """
         logger.info(f"Building knowledge base for {domain} with {len(pages)} pages")
 
+        collection_name = self.create_knowledge_base(domain)
+        await self.add_pages(collection_name, pages)
+        self.finalize_knowledge_base(collection_name, domain, pages)
+
+        return collection_name
+
+    def create_knowledge_base(self, domain: str, version: Optional[str] = None) -> str:
+        """
+        Create (or recreate) the empty collection for a domain. A version gives
+        the collection its own name, so it can be built while the previous one
+        keeps serving.
+        """
         # Create collection name
         collection_name = f"website_{domain.replace('.', '_')}"
+        if version:
+            collection_name = f"{collection_name}_{version}"
 
-        # Use centralized manager to create collection
-        collection = chroma_manager.create_collection(
-            name=collection_name, metadata={"hnsw:space": "cosine", "domain": domain}
+        # Use centralized manager to create collection (it adds the HNSW settings)
+        chroma_manager.create_collection(
+            name=collection_name, metadata={"domain": domain}
         )
 
-        # Process all pages
-        all_chunks = []
-        all_embeddings = []
-        all_metadatas = []
-        all_ids = []
+        return collection_name
 
-        for page_idx, page in enumerate(pages):
-            logger.info(f"Processing page {page_idx + 1}/{len(pages)}: {page.url}")
+    async def add_pages(
+        self, collection_name: str, pages: List[CrawledPage], start_index: int = 0
+    ) -> int:
+        """
+        Process a batch of pages and add their chunks to the collection.
+        start_index is the position of the first page in the whole crawl and
+        keeps chunk ids unique across batches.
+        """
+        collection = chroma_manager.get_collection(collection_name)
+
+        # (id, text, metadata) chunks waiting to be embedded
+        pending: List[Tuple[str, str, Dict]] = []
+        total_chunks = 0
+
+        # Process the pages concurrently with the multimodal parser; results
+        # come back in page order so chunk ids stay stable
+        semaphore = asyncio.Semaphore(self.PARSE_CONCURRENCY)
+
+        async def process(page: CrawledPage) -> Optional[ProcessedContent]:
+            async with semaphore:
+                try:
+                    return await self.parser.process_page(page)
+                except Exception as e:
+                    logger.error(f"Error processing page {page.url}: {e}")
+                    return None
+
+        processed_pages = await asyncio.gather(*(process(page) for page in pages))
+
+        for page_idx, (page, processed_content) in enumerate(
+            zip(pages, processed_pages), start=start_index
+        ):
+            if processed_content is None:
+                continue
+            logger.info(f"Processing page {page_idx + 1}: {page.url}")
 
             try:
-                # Process page with multimodal parser
-                processed_content = await self.parser.process_page(page)
-
                 # Convert to knowledge chunks
                 chunks = self._create_knowledge_chunks(page, processed_content)
 
                 # Add to batch
                 for chunk_idx, chunk in enumerate(chunks):
                     chunk_id = f"page_{page_idx}_chunk_{chunk_idx}"
-                    all_chunks.append(chunk["text"])
-                    all_metadatas.append(chunk["metadata"])
-                    all_ids.append(chunk_id)
+                    pending.append((chunk_id, chunk["text"], chunk["metadata"]))
 
             except Exception as e:
                 logger.error(f"Error processing page {page.url}: {e}")
                 continue
 
-        # Generate embeddings in batches
-        logger.info(f"Generating embeddings for {len(all_chunks)} chunks")
-        batch_size = 32
-
-        for i in range(0, len(all_chunks), batch_size):
-            batch_texts = all_chunks[i : i + batch_size]
-            batch_embeddings = self.embedding_model.encode(batch_texts)
-            all_embeddings.extend(batch_embeddings.tolist())
-
-        # Add to collection
-        logger.info("Adding to ChromaDB")
-        if all_chunks:  # Only add if we have data
-            collection.add(
-                embeddings=all_embeddings,
-                documents=all_chunks,
-                metadatas=all_metadatas,
-                ids=all_ids,
-            )
+            if len(pending) >= self.CHUNK_BATCH:
+                await self.embed_and_add(collection, pending)
+                total_chunks += len(pending)
+                pending = []
+
+        if pending:
+            await self.embed_and_add(collection, pending)
+            total_chunks += len(pending)
+
+        return total_chunks
+
+    async def embed_and_add(self, collection, chunks: List[Tuple[str, str, Dict]]):
+        """
+        Embed a batch of (id, text, metadata) chunks with one encode call and
+        write them with one collection.add, both off the event loop so crawling
+        can continue meanwhile
+        """
+        ids, texts, metadatas = (list(column) for column in zip(*chunks))
+        logger.info(f"Embedding and adding {len(texts)} chunks")
+
+        embeddings = await asyncio.to_thread(
+            self.embedding_model.encode, texts, batch_size=64
+        )
+        await asyncio.to_thread(
+            collection.add,
+            ids=ids,
+            embeddings=embeddings.tolist(),
+            documents=texts,
+            metadatas=metadatas,
+        )
 
+    def finalize_knowledge_base(
+        self, collection_name: str, domain: str, pages: List[CrawledPage]
+    ):
+        """
+        Record collection metadata once every page has been added
+        """
         # Save collection metadata
         self._save_collection_metadata(collection_name, domain, pages)
 
         logger.info(f"Knowledge base created successfully: {collection_name}")
-        return collection_name
+
+    def drop_knowledge_base(self, collection_name: str):
+        """
+        Delete a collection and its metadata entry
+        """
+        chroma_manager.delete_collection(collection_name)
+        try:
+            chroma_manager.get_collection("_metadata").delete(ids=[collection_name])
+        except Exception as e:
+            logger.debug(f"No metadata to remove for {collection_name}: {e}")
 
     def _create_knowledge_chunks(
         self, page: CrawledPage, content: ProcessedContent
@@ -30,7 +30,7 @@ class LayoutAnalyzer:
         """
         Analyze page layout from screenshot and HTML
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         
         # Analyze HTML structure
         structure = self._analyze_html_structure(soup)
@@ -82,7 +82,7 @@ class LayoutAnalyzer:
                     'type': tag,
                     'id': elem.get('id', ''),
                     'class': ' '.join(elem.get('class', [])),
-                    'text_preview': elem.get_text()[:100].strip(),
+                    'text_preview': self._text_preview(elem),
                     'importance': self._calculate_importance(elem)
                 })
                 
@@ -97,7 +97,7 @@ class LayoutAnalyzer:
                             'type': pattern_type,
                             'id': elem.get('id', ''),
                             'class': ' '.join(elem.get('class', [])),
-                            'text_preview': elem.get_text()[:100].strip(),
+                            'text_preview': self._text_preview(elem),
                             'importance': self._calculate_importance(elem)
                         })
                         
@@ -109,12 +109,26 @@ class LayoutAnalyzer:
                             'type': pattern_type,
                             'id': elem.get('id', ''),
                             'class': ' '.join(elem.get('class', [])),
-                            'text_preview': elem.get_text()[:100].strip(),
+                            'text_preview': self._text_preview(elem),
                             'importance': self._calculate_importance(elem)
                         })
                         
         return sorted(sections, key=lambda x: x['importance'], reverse=True)
         
+    def _text_preview(self, elem, limit: int = 100) -> str:
+        """
+        Same as elem.get_text()[:limit].strip(), but stops reading text nodes
+        once it has enough instead of joining the whole subtree first
+        """
+        parts = []
+        length = 0
+        for text in elem.strings:
+            parts.append(text)
+            length += len(text)
+            if length >= limit:
+                break
+        return ''.join(parts)[:limit].strip()
+        
     def _analyze_visual_hierarchy(self, soup: BeautifulSoup) -> List[Dict]:
         """
         Analyze visual hierarchy based on heading structure
@@ -1,3 +1,4 @@
+import asyncio
 import torch
 from PIL import Image
 from typing import Dict, List, Optional, Tuple
@@ -21,6 +22,10 @@ from .layout_analyzer import LayoutAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Contact details picked out of the page markup
+EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+PHONE_RE = re.compile(r"[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]")
+
 
 @dataclass
 class ProcessedContent:
@@ -70,10 +75,7 @@ class MultimodalParser:
         """
         logger.info(f"Processing {crawled_page.url}")
 
-        # 1. Overall page understanding using screenshots
-        page_understanding = await self._understand_page_context(crawled_page)
-
-        # 2. Layout analysis
+        # Layout analysis
         layout_structure = {}
         if self.layout_analyzer and crawled_page.screenshots:
             layout_structure = await self.layout_analyzer.analyze(
@@ -81,27 +83,40 @@ class MultimodalParser:
                 crawled_page.html,
             )
 
-        # 3. Extract and process text with context
-        text_chunks = await self._process_text_content(
-            crawled_page, layout_structure, page_understanding
-        )
+        # HTML parsing is CPU-bound, so keep it off the event loop. It stays on
+        # a thread: worker processes would re-run the server script's imports
+        # (torch, CUDA setup) on start
+        return await asyncio.to_thread(self._process_html, crawled_page, layout_structure)
 
-        # 4. Process visual elements
-        visual_elements = await self._process_visual_content(
-            crawled_page, page_understanding
-        )
+    def _process_html(
+        self, crawled_page: CrawledPage, layout_structure: Dict
+    ) -> ProcessedContent:
+        """
+        Run every HTML-based step over a single parse of the page
+        """
+        # lxml is a C tokenizer, several times faster than html.parser
+        soup = BeautifulSoup(crawled_page.html, "lxml")
 
-        # 5. Process structured data (tables, lists, etc.)
-        structured_data = await self._process_structured_content(
-            crawled_page, page_understanding
+        # 1. Overall page understanding
+        page_understanding = self._understand_page_context(crawled_page, soup)
+
+        # 2. Process structured data (tables, lists, etc.)
+        structured_data = self._process_structured_content(
+            crawled_page, soup, page_understanding
         )
 
-        # 6. Process interactive elements
-        interactions = await self._process_interactions(
-            crawled_page, page_understanding
+        # 3. Extract and process text with context (strips script/style from soup)
+        text_chunks = self._process_text_content(
+            crawled_page, soup, layout_structure, page_understanding
         )
 
-        # 7. Identify relationships between elements
+        # 4. Process visual elements
+        visual_elements = self._process_visual_content(crawled_page, page_understanding)
+
+        # 5. Process interactive elements
+        interactions = self._process_interactions(crawled_page, page_understanding)
+
+        # 6. Identify relationships between elements
         relationships = self._identify_relationships(
             text_chunks, visual_elements, structured_data, interactions
         )
@@ -115,13 +130,11 @@ class MultimodalParser:
             page_understanding=page_understanding,
         )
 
-    async def _understand_page_context(self, page: CrawledPage) -> Dict:
+    def _understand_page_context(self, page: CrawledPage, soup: BeautifulSoup) -> Dict:
         """
         Understand overall page context and purpose
         """
         # For now, use HTML analysis instead of vision model
-        soup = BeautifulSoup(page.html, "html.parser")
-
         understanding = {
             "page_type": self._detect_page_type(page, soup),
             "purpose": self._extract_page_purpose(soup),
@@ -131,14 +144,12 @@ class MultimodalParser:
 
         return understanding
 
-    async def _process_text_content(
-        self, page: CrawledPage, layout: Dict, context: Dict
+    def _process_text_content(
+        self, page: CrawledPage, soup: BeautifulSoup, layout: Dict, context: Dict
     ) -> List[Dict]:
         """
         Process text content with semantic understanding and context
         """
-        soup = BeautifulSoup(page.html, "html.parser")
-
         # Remove script and style elements
         for script in soup(["script", "style"]):
             script.decompose()
@@ -196,7 +207,7 @@ class MultimodalParser:
 
         return text_chunks
 
-    async def _process_visual_content(
+    def _process_visual_content(
         self, page: CrawledPage, context: Dict
     ) -> List[Dict]:
         """
@@ -204,7 +215,9 @@ class MultimodalParser:
         """
         visual_elements = []
 
-        # Process images from media
+        # Process images from media. They are described from alt/title only:
+        # the crawler blocks image downloads, so there are no bytes for
+        # VisualAnalyzer.analyze_images
         for media_item in page.media:
             if media_item.get("type") == "image":
                 element = {
@@ -220,14 +233,13 @@ class MultimodalParser:
 
         return visual_elements
 
-    async def _process_structured_content(
-        self, page: CrawledPage, context: Dict
+    def _process_structured_content(
+        self, page: CrawledPage, soup: BeautifulSoup, context: Dict
     ) -> List[Dict]:
         """
         Process structured data like tables, lists, etc.
         """
         structured_data = []
-        soup = BeautifulSoup(page.html, "html.parser")
 
         # Process tables
         for table in soup.find_all("table"):
@@ -266,7 +278,7 @@ class MultimodalParser:
 
         return structured_data
 
-    async def _process_interactions(
+    def _process_interactions(
         self, page: CrawledPage, context: Dict
     ) -> List[Dict]:
         """
@@ -379,18 +391,17 @@ class MultimodalParser:
         Extract key information from the page
         """
         key_info = []
+        markup = str(soup)
 
-        # Check for contact info
-        email_pattern = r"[\w\.-]+@[\w\.-]+\.\w+"
-        emails = re.findall(email_pattern, str(soup))
-        if emails:
-            key_info.append(f"Email: {emails[0]}")
+        # Check for contact info; only the first match is used
+        email = EMAIL_RE.search(markup)
+        if email:
+            key_info.append(f"Email: {email.group()}")
 
         # Check for phone numbers
-        phone_pattern = r"[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]"
-        phones = re.findall(phone_pattern, str(soup))
-        if phones:
-            key_info.append(f"Phone: {phones[0]}")
+        phone = PHONE_RE.search(markup)
+        if phone:
+            key_info.append(f"Phone: {phone.group()}")
 
         # Check for addresses in structured data
         if page.structured_data.get("json_ld"):
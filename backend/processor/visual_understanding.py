@@ -1,3 +1,5 @@
+import asyncio
+import os
 import torch
 from PIL import Image
 from transformers import BlipProcessor, BlipForConditionalGeneration, TrOCRProcessor, VisionEncoderDecoderModel
@@ -9,6 +11,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Images captioned per BLIP generate() call
+VISION_BATCH = int(os.getenv("VISION_BATCH", "32"))
+
 class VisualAnalyzer:
     """
     Analyzes visual content from web pages
@@ -41,37 +46,66 @@ class VisualAnalyzer:
         """
         Analyze an image and extract information
         """
+        return (await self.analyze_images([image_bytes], context))[0]
+        
+    async def analyze_images(self, images: List[bytes], context: Dict = {}) -> List[Dict]:
+        """
+        Analyze several images, captioning them in batches off the event loop
+        """
         if not self.blip_model:
-            return {"error": "Visual model not loaded"}
-            
-        try:
-            # Load image
-            image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+            return [{"error": "Visual model not loaded"} for _ in images]
             
-            # Generate caption
-            inputs = self.blip_processor(image, return_tensors="pt")
-            if torch.cuda.is_available():
-                inputs = {k: v.cuda() for k, v in inputs.items()}
+        return await asyncio.to_thread(self._analyze_batch, images, context)
+        
+    def _analyze_batch(self, images: List[bytes], context: Dict) -> List[Dict]:
+        """
+        Decode images, caption VISION_BATCH of them per generate() call
+        """
+        results: List[Optional[Dict]] = [None] * len(images)
+        decoded = []
+        for i, image_bytes in enumerate(images):
+            try:
+                decoded.append((i, Image.open(io.BytesIO(image_bytes)).convert('RGB')))
+            except Exception as e:
+                logger.error(f"Error analyzing image: {e}")
+                results[i] = {"error": str(e)}
                 
-            # Generate description
-            out = self.blip_model.generate(**inputs, max_length=50)
-            caption = self.blip_processor.decode(out[0], skip_special_tokens=True)
-            
-            # Analyze image properties
-            analysis = {
-                "caption": caption,
-                "size": image.size,
-                "mode": image.mode,
-                "has_text": self._detect_text_regions(image),
-                "dominant_colors": self._extract_dominant_colors(image),
-                "image_type": self._classify_image_type(caption, context)
-            }
-            
-            return analysis
+        for start in range(0, len(decoded), VISION_BATCH):
+            batch = decoded[start:start + VISION_BATCH]
+            try:
+                captions = self._caption([image for _, image in batch])
+            except Exception as e:
+                logger.error(f"Error analyzing image: {e}")
+                for i, _ in batch:
+                    results[i] = {"error": str(e)}
+                continue
+                
+            for (i, image), caption in zip(batch, captions):
+                # Analyze image properties
+                results[i] = {
+                    "caption": caption,
+                    "size": image.size,
+                    "mode": image.mode,
+                    "has_text": self._detect_text_regions(image),
+                    "dominant_colors": self._extract_dominant_colors(image),
+                    "image_type": self._classify_image_type(caption, context)
+                }
+                
+        return results
+        
+    def _caption(self, images: List[Image.Image]) -> List[str]:
+        """
+        Generate one caption per image in a single padded batch
+        """
+        inputs = self.blip_processor(images=images, return_tensors="pt")
+        if torch.cuda.is_available():
+            inputs = {k: v.to("cuda", non_blocking=True) for k, v in inputs.items()}
+            # pixel_values must match the FP16 weights
+            inputs["pixel_values"] = inputs["pixel_values"].half()
             
-        except Exception as e:
-            logger.error(f"Error analyzing image: {e}")
-            return {"error": str(e)}
+        with torch.inference_mode():
+            out = self.blip_model.generate(**inputs, max_length=50)
+        return self.blip_processor.batch_decode(out, skip_special_tokens=True)
             
     def _detect_text_regions(self, image: Image) -> bool:
         """
@@ -71,13 +71,13 @@
                 </div>
                 
                 <div class="ai-chatbot-suggestions" id="ai-chatbot-suggestions" style="display: none;">
-                    <div class="ai-chatbot-suggestion" onclick="AIChatbot.sendSuggestion(this)">
+                    <div class="ai-chatbot-suggestion">
                         What services do you offer?
                     </div>
-                    <div class="ai-chatbot-suggestion" onclick="AIChatbot.sendSuggestion(this)">
+                    <div class="ai-chatbot-suggestion">
                         How can I contact you?
                     </div>
-                    <div class="ai-chatbot-suggestion" onclick="AIChatbot.sendSuggestion(this)">
+                    <div class="ai-chatbot-suggestion">
                         Tell me more about this
                     </div>
                 </div>
@@ -655,9 +655,11 @@
         </style>
     `;
 
-	// Inject HTML and styles
-	document.head.insertAdjacentHTML("beforeend", styles);
-	document.body.insertAdjacentHTML("beforeend", widgetHTML);
+	// Inject HTML and styles; called on first use, see getChatbot
+	function mountWidget() {
+		document.head.insertAdjacentHTML("beforeend", styles);
+		document.body.insertAdjacentHTML("beforeend", widgetHTML);
+	}
 
 	// API class with improved error handling
 	class ChatbotAPI {
@@ -735,6 +737,10 @@
 			this.suggestions = document.getElementById("ai-chatbot-suggestions");
 			this.domain = config.domain;
 
+			// Typing indicators by id, so removal needs no DOM lookup
+			this._typingSeq = 0;
+			this._typingNodes = new Map();
+
 			this.init();
 		}
 
@@ -766,11 +772,25 @@
 			});
 
 			// Focus input when clicking messages area
-			this.messages.addEventListener("click", (e) => {
-				if (e.target === this.messages && isReady) {
-					this.input.focus();
-				}
-			});
+			this.messages.addEventListener(
+				"click",
+				(e) => {
+					if (e.target === this.messages && isReady) {
+						this.input.focus();
+					}
+				},
+				{ passive: true }
+			);
+
+			// One delegated listener for every suggestion chip, however often they are replaced
+			this.suggestions.addEventListener(
+				"click",
+				(e) => {
+					const suggestion = e.target.closest(".ai-chatbot-suggestion");
+					if (suggestion) this.sendSuggestion(suggestion);
+				},
+				{ passive: true }
+			);
 		}
 
 		setupAutoResize() {
@@ -813,15 +833,17 @@
 
 		onReady() {
 			isReady = true;
-			this.input.disabled = false;
-			this.input.placeholder = "Type your message...";
 
+			// Look the elements up first, then apply every write in one frame
 			const statusElement = document.querySelector(".ai-chatbot-status-detail");
-			statusElement.textContent = "Online";
-
-			// Clear loading state
 			const loading = document.getElementById("ai-chatbot-loading");
-			if (loading) loading.style.display = "none";
+			requestAnimationFrame(() => {
+				this.input.disabled = false;
+				this.input.placeholder = "Type your message...";
+				statusElement.textContent = "Online";
+				// Clear loading state
+				if (loading) loading.style.display = "none";
+			});
 
 			// Show welcome message after a delay
 			setTimeout(() => {
@@ -854,7 +876,6 @@
 				const suggestion = document.createElement("div");
 				suggestion.className = "ai-chatbot-suggestion";
 				suggestion.textContent = text;
-				suggestion.onclick = () => this.sendSuggestion(suggestion);
 				this.suggestions.appendChild(suggestion);
 			});
 			this.suggestions.style.display = "flex";
@@ -950,7 +971,8 @@
 				const response = await api.sendMessage(message, sessionId, this.domain);
 
 				// Store session ID
-				if (response.session_id) {
+				// localStorage writes are synchronous, so only write a changed id
+				if (response.session_id && response.session_id !== sessionId) {
 					sessionId = response.session_id;
 					localStorage.setItem("ai_chatbot_session", sessionId);
 				}
@@ -1084,18 +1106,26 @@
 			this.messages.appendChild(messageDiv);
 
 			// Smooth scroll to bottom
+			this.scheduleScroll("smooth");
+		}
+
+		scheduleScroll(behavior) {
+			// At most one scroll (and one scrollHeight read) per frame, using the latest behavior
+			this.scrollBehavior = behavior;
+			if (this.scrollPending) return;
+			this.scrollPending = true;
 			requestAnimationFrame(() => {
+				this.scrollPending = false;
 				this.messages.scrollTo({
 					top: this.messages.scrollHeight,
-					behavior: "smooth",
+					behavior: this.scrollBehavior,
 				});
 			});
 		}
 
 		showTyping() {
-			const typingId = `typing-${Date.now()}`;
+			const typingId = ++this._typingSeq;
 			const typingDiv = document.createElement("div");
-			typingDiv.id = typingId;
 			typingDiv.className = "ai-chatbot-message ai-chatbot-message-bot";
 			typingDiv.innerHTML = `
                 <div class="ai-chatbot-message-avatar">AI</div>
@@ -1109,14 +1139,16 @@
             `;
 
 			this.messages.appendChild(typingDiv);
-			this.messages.scrollTop = this.messages.scrollHeight;
+			this._typingNodes.set(typingId, typingDiv);
+			this.scheduleScroll("auto");
 
 			return typingId;
 		}
 
 		removeTyping(typingId) {
-			const typingDiv = document.getElementById(typingId);
+			const typingDiv = this._typingNodes.get(typingId);
 			if (typingDiv) {
+				this._typingNodes.delete(typingId);
 				typingDiv.style.opacity = "0";
 				setTimeout(() => typingDiv.remove(), 200);
 			}
@@ -1133,24 +1165,37 @@
 		}
 	}
 
-	// Initialize chatbot
-	const chatbot = new AIChatbot();
+	// Mount lazily so the widget's DOM and CSS parse stay off the host page's load path
+	let chatbot = null;
+	function getChatbot() {
+		if (!chatbot) {
+			mountWidget();
+			chatbot = new AIChatbot();
+		}
+		return chatbot;
+	}
+
+	if ("requestIdleCallback" in window) {
+		requestIdleCallback(getChatbot, { timeout: 3000 });
+	} else {
+		setTimeout(getChatbot, 1);
+	}
 
-	// Expose API for external control
+	// Expose API for external control; calling it before idle mounts immediately
 	window.AIChatbot = {
-		open: () => chatbot.open(),
-		close: () => chatbot.close(),
-		toggle: () => chatbot.toggle(),
-		minimize: () => chatbot.minimize(),
-		sendMessage: () => chatbot.sendMessage(),
-		sendSuggestion: (element) => chatbot.sendSuggestion(element),
+		open: () => getChatbot().open(),
+		close: () => getChatbot().close(),
+		toggle: () => getChatbot().toggle(),
+		minimize: () => getChatbot().minimize(),
+		sendMessage: () => getChatbot().sendMessage(),
+		sendSuggestion: (element) => getChatbot().sendSuggestion(element),
 	};
 
 	// Auto-open on mobile after delay
 	if (window.innerWidth < 768 && config.autoStart) {
 		setTimeout(() => {
 			if (!isOpen) {
-				chatbot.open();
+				getChatbot().open();
 			}
 		}, 5000);
 	}
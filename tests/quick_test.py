@@ -181,21 +181,39 @@ if not chromadb_manager_path.exists():
 
 # Now do the regular imports
 import asyncio
-from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket
+import brotli
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, WebSocket
+from fastapi.websockets import WebSocketDisconnect, WebSocketState
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, Response
-from pydantic import BaseModel
+from fastapi.responses import (
+    HTMLResponse,
+    ORJSONResponse,
+    Response,
+    StreamingResponse,
+)
+from pydantic import BaseModel, Field, field_validator
 import uvicorn
 import logging
-from datetime import datetime
+from collections import deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+import gc
 import json
+import orjson
+import re
+import secrets
 import time
 import psutil
 import torch
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 import threading
+import functools
+import gzip
 import hashlib
+import html
+from cachetools import LRUCache, TTLCache
 import chromadb
+from chromadb.errors import ChromaError
 from sentence_transformers import SentenceTransformer
 
 # Configure detailed logging
@@ -209,8 +227,12 @@ try:
     from backend.crawler.intelligent_crawler import IntelligentCrawler, CrawledPage
     from backend.processor.multimodal_parser import MultimodalParser, ProcessedContent
     from backend.processor.knowledge_builder import KnowledgeBuilder
-    from backend.chatbot.reasoning_engine import ReasoningEngine, ReasoningResponse
-    from backend.chatbot.retrieval_optimizer import OptimizedRetriever
+    from backend.chatbot.reasoning_engine import (
+        ReasoningEngine,
+        ReasoningResponse,
+        stream_sentences,
+    )
+    from backend.chatbot.retrieval_optimizer import OptimizedRetriever, get_reranker
     from backend.chatbot.complexity_classifier import (
         ComplexityClassifier,
         QueryComplexity,
@@ -224,22 +246,105 @@ except Exception as e:
     raise
 
 # Create FastAPI app
-app = FastAPI(title="AI Chatbot Production Test - Full Components")
+app = FastAPI(
+    title="AI Chatbot Production Test - Full Components",
+    default_response_class=ORJSONResponse,
+)
+
+class CrossOriginPathsCORS:
+    """CORS for the routes embedding pages call; everything else skips it"""
 
-# Enable CORS
+    PREFIXES = ("/api/", "/widget/")
+
+    def __init__(self, app, **options):
+        self.app = app
+        self.cors = CORSMiddleware(app, **options)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.PREFIXES):
+            await self.cors(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+# Enable CORS; widget POSTs are preflighted, so let browsers cache the
+# preflight for as long as they allow
 app.add_middleware(
-    CORSMiddleware,
+    CrossOriginPathsCORS,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=7200,
 )
 
-# Global state with thread-safe updates
-crawl_jobs = {}
-crawl_jobs_lock = threading.Lock()
-knowledge_bases = {}
-active_sessions = {}
+
+JOB_TTL_SECONDS = 3600
+
+
+# Global state with thread-safe updates. Crawl jobs are spread over shards, each
+# with its own lock and subscriber table, so updates to different jobs don't
+# contend. Job entries are copy-on-write snapshots: writers swap in a new dict
+# under the shard lock, readers take none. Locked sections never await, so the
+# lock is never held across a suspension point, and WebSocket subscribers are
+# woken through their asyncio.Queue rather than by polling.
+@dataclass
+class JobShard:
+    # Every write re-arms an entry's TTL, so only finished or abandoned jobs
+    # age out
+    jobs: Dict[str, Dict] = field(
+        default_factory=lambda: TTLCache(maxsize=256, ttl=JOB_TTL_SECONDS)
+    )
+    subscribers: Dict[str, List[asyncio.Queue]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class CopyOnWriteDict:
+    """Dict whose writers swap in a new copy, so readers never lock or see a
+    half-applied update. Writers serialize on a lock held only for the copy."""
+
+    def __init__(self):
+        self._data: Dict = {}
+        self._write_lock = threading.Lock()
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def snapshot(self) -> Dict:
+        """The current mapping; callers must not mutate it"""
+        return self._data
+
+    def set(self, key, value):
+        self.merge({key: value})
+
+    def merge(self, updates: Dict):
+        with self._write_lock:
+            self._data = {**self._data, **updates}
+
+
+JOB_SHARD_COUNT = 64
+crawl_job_shards = [JobShard() for _ in range(JOB_SHARD_COUNT)]
+WS_HEARTBEAT_SECONDS = 30
+# Each crawl drives its own browsers, so only a few run at once; the rest wait
+# for a slot. A domain already being crawled hands back the running job.
+MAX_CONCURRENT_CRAWLS = int(os.getenv("MAX_CRAWLS", "4"))
+crawl_slots = asyncio.Semaphore(MAX_CONCURRENT_CRAWLS)
+crawls_in_flight: Dict[str, str] = {}
+# Analyzed domains, mirrored to disk so they survive restarts and are visible
+# to other server processes sharing ./chroma_db
+KB_META_PATH = "./chroma_db/knowledge_bases.json"
+knowledge_bases = CopyOnWriteDict()
+# Retrievers keyed by collection name; building one loads BM25 and the reranker,
+# so the most recently used ones are kept and the rest released
+retrievers = LRUCache(maxsize=64)
+# Knowledge-backed answers keyed by (collection name, normalized question), so
+# repeated questions skip retrieval and reranking
+answer_cache = TTLCache(maxsize=1024, ttl=600)
+# Idle sessions age out instead of accumulating for the life of the server
+active_sessions = TTLCache(maxsize=10_000, ttl=3600)
 models_loaded = False
 
 # Initialize production components
@@ -264,10 +369,76 @@ TEST_MODEL_CONFIG = {
 }
 
 
+def job_shard(job_id: str) -> JobShard:
+    """Return the shard that owns a crawl job"""
+    return crawl_job_shards[hash(job_id) % JOB_SHARD_COUNT]
+
+
+def publish_job_update(snapshot: Dict, subscribers: List[asyncio.Queue]):
+    """Push a job snapshot to WebSocket subscribers (no lock needed)"""
+    for queue in subscribers:
+        # Drop the oldest pending snapshot so slow clients still see the latest
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(snapshot)
+
+
+def update_job(job_id: str, updates: Dict):
+    """Apply updates to a crawl job and notify its subscribers"""
+    shard = job_shard(job_id)
+    with shard.lock:
+        if job_id not in shard.jobs:
+            return
+        snapshot = shard.jobs[job_id] = {**shard.jobs[job_id], **updates}
+        subscribers = list(shard.subscribers.get(job_id, ()))
+    # Fan out after releasing the lock; the snapshot is never mutated
+    publish_job_update(snapshot, subscribers)
+
+
+class BatchedJobUpdater:
+    """Coalesces bursts of job updates into one write per flush window"""
+
+    def __init__(self, job_id: str, flush_ms: int = 50):
+        self.job_id = job_id
+        self.flush_delay = flush_ms / 1000
+        self.pending: Dict = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def update(self, updates: Dict):
+        """Merge updates and schedule a flush if none is pending"""
+        self.pending.update(updates)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_delay, self.flush
+            )
+
+    def flush(self):
+        """Write all pending updates immediately"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self.pending:
+            updates, self.pending = self.pending, {}
+            update_job(self.job_id, updates)
+
+
+# Scheme and path around the host in a pasted URL
+_DOMAIN_CLEANUP_RE = re.compile(r"^https?://|/.*$")
+
+
 # Request models
 class CrawlRequest(BaseModel):
     domain: str
-    max_pages: int = 20
+    max_pages: int = Field(20, ge=1, le=500)
+
+    @field_validator("domain")
+    @classmethod
+    def clean_domain(cls, domain: str) -> str:
+        """Reduce a pasted URL to its host, so every job for a site shares a key"""
+        domain = _DOMAIN_CLEANUP_RE.sub("", domain.strip()).lower()
+        if not domain:
+            raise ValueError("domain must not be empty")
+        return domain
 
 
 class ChatRequest(BaseModel):
@@ -293,6 +464,9 @@ async def initialize_models():
         knowledge_builder = KnowledgeBuilder(multimodal_parser)
         reasoning_engine = ReasoningEngine(TEST_MODEL_CONFIG["reasoning_models"])
         complexity_classifier = ComplexityClassifier()
+        # Retrievers share one cross-encoder; load it now rather than on the
+        # first chat
+        await asyncio.to_thread(get_reranker)
 
         models_loaded = True
         logger.info("✅ All models initialized successfully!")
@@ -302,33 +476,108 @@ async def initialize_models():
         models_loaded = True
 
 
+# Modification time of the index as last read or written by this process
+_kb_index_mtime = 0
+
+
+def kb_index_changed() -> bool:
+    """Whether the on-disk index differs from the one already merged"""
+    try:
+        return os.stat(KB_META_PATH).st_mtime_ns != _kb_index_mtime
+    except FileNotFoundError:
+        return False
+
+
+def load_knowledge_bases():
+    """Merge the on-disk knowledge base index into memory"""
+    global _kb_index_mtime
+    try:
+        with open(KB_META_PATH, "rb") as f:
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+            knowledge_bases.merge(orjson.loads(f.read()))
+        _kb_index_mtime = mtime
+    except FileNotFoundError:
+        pass
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"Ignoring unreadable {KB_META_PATH}: {e}")
+
+
+def save_knowledge_bases():
+    """Write the knowledge base index atomically"""
+    global _kb_index_mtime
+    os.makedirs(os.path.dirname(KB_META_PATH), exist_ok=True)
+    tmp_path = f"{KB_META_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(knowledge_bases.snapshot()))
+    os.replace(tmp_path, KB_META_PATH)
+    _kb_index_mtime = os.stat(KB_META_PATH).st_mtime_ns
+
+
+async def lookup_knowledge_base(domain: str) -> Optional[Dict]:
+    """Knowledge base info for domain, rereading the index on a miss"""
+    # Crawls store hosts lowercased; only reread the index when another
+    # process has rewritten it, so unknown domains don't cost a file parse
+    domain = domain.lower()
+    if domain not in knowledge_bases and kb_index_changed():
+        await asyncio.to_thread(load_knowledge_bases)
+    return knowledge_bases.get(domain)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize models on startup"""
+    start_system_sampler()
+    await asyncio.to_thread(load_knowledge_bases)
     await initialize_models()
+    # Models and modules live for the whole process; move them out of the
+    # cyclic GC's generations so collections don't keep rescanning them
+    gc.collect()
+    gc.freeze()
 
 
 # Enhanced crawler with proper progress tracking
 class ProductionCrawler(IntelligentCrawler):
     """Production crawler with progress tracking"""
 
-    def __init__(self, domain: str, max_pages: int, job_id: str):
+    # Report progress every few pages or every quarter second, not per page
+    PROGRESS_EVERY_PAGES = 5
+    PROGRESS_EVERY_SECONDS = 0.25
+
+    def __init__(
+        self,
+        domain: str,
+        max_pages: int,
+        job_id: str,
+        updater: Optional[BatchedJobUpdater] = None,
+    ):
         super().__init__(domain, max_pages)
         self.job_id = job_id
+        self.updater = updater or BatchedJobUpdater(job_id)
         self.pages_found = 0
+        self._pages_reported = 0
+        self._last_report = time.monotonic()
+
+    def _on_page_crawled(self, page: CrawledPage):
+        """Count the page and report progress when a window has passed"""
+        self.pages_found += 1
+        if (
+            self.pages_found - self._pages_reported >= self.PROGRESS_EVERY_PAGES
+            or time.monotonic() - self._last_report >= self.PROGRESS_EVERY_SECONDS
+        ):
+            self._update_job_progress()
 
     def _update_job_progress(self):
         """Update job progress"""
-        with crawl_jobs_lock:
-            if self.job_id in crawl_jobs:
-                progress = min(40, int((len(self.pages) / self.max_pages) * 40))
-                crawl_jobs[self.job_id].update(
-                    {
-                        "pages_crawled": len(self.pages),
-                        "progress": progress,
-                        "status": "crawling",
-                    }
-                )
+        self._pages_reported = self.pages_found
+        self._last_report = time.monotonic()
+        progress = min(40, int((len(self.pages) / self.max_pages) * 40))
+        self.updater.update(
+            {
+                "pages_crawled": len(self.pages),
+                "progress": progress,
+                "status": "crawling",
+            }
+        )
 
     async def _crawler_worker(self, worker_id: int):
         """Override to add progress updates"""
@@ -336,11 +585,17 @@ class ProductionCrawler(IntelligentCrawler):
         self._update_job_progress()
 
 
-@app.get("/")
-async def home():
-    """Production test interface"""
-    return HTMLResponse(
-        """
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+
+
+def minify_source(source: str) -> str:
+    """Drop CSS comments, indentation, blank lines and whole-line // comments"""
+    lines = (line.strip() for line in _CSS_COMMENT_RE.sub("", source).splitlines())
+    # Newlines are kept so automatic semicolon insertion still applies
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+HOME_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -657,6 +912,7 @@ async def home():
         let currentJobId = null;
         let statusInterval = null;
         let timeInterval = null;
+        let jobFinished = false;
         let startTime = null;
         let selectedPages = 20;
         let testPageOpened = false;
@@ -676,8 +932,13 @@ async def home():
             }
         }
         
-        // Update system info every 2 seconds
-        setInterval(updateSystemInfo, 2000);
+        // Update system info every 2 seconds, but not while the tab is hidden
+        setInterval(() => {
+            if (!document.hidden) updateSystemInfo();
+        }, 2000);
+        document.addEventListener('visibilitychange', () => {
+            if (!document.hidden) updateSystemInfo();
+        });
         updateSystemInfo();
         
         function selectPages(count, btn) {
@@ -699,6 +960,7 @@ async def home():
             
             // Reset test page flag
             testPageOpened = false;
+            jobFinished = false;
             
             // Clean domain
             const cleanDomain = domain.replace(/^https?:\\/\\//, '').replace(/\\/.*$/, '');
@@ -737,10 +999,7 @@ async def home():
                     currentJobId = data.job_id;
                     updateStatus(`🚀 Initializing AI analysis of ${cleanDomain}...`);
                     
-                    // Start monitoring
-                    statusInterval = setInterval(checkStatus, 500);
-                    
-                    // Try WebSocket connection
+                    // Monitor over the WebSocket, polling only while it is down
                     connectWebSocket(data.job_id);
                 } else {
                     throw new Error(data.detail || 'Failed to start');
@@ -754,20 +1013,40 @@ async def home():
             }
         }
         
+        function startPolling() {
+            if (!statusInterval && !jobFinished) {
+                statusInterval = setInterval(checkStatus, 500);
+            }
+        }
+        
+        function stopPolling() {
+            clearInterval(statusInterval);
+            statusInterval = null;
+        }
+        
         function connectWebSocket(jobId) {
             try {
-                const ws = new WebSocket(`ws://localhost:8000/ws/${jobId}`);
+                const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+                const ws = new WebSocket(`${scheme}://${location.host}/ws/${jobId}`);
+                // The server sends the full state first, then only changed fields
+                let jobState = {};
+                
+                ws.onopen = () => stopPolling();
                 
                 ws.onmessage = (event) => {
-                    const data = JSON.parse(event.data);
-                    updateFromWebSocket(data);
+                    jobState = { ...jobState, ...JSON.parse(event.data) };
+                    updateFromWebSocket(jobState);
+                    if (jobFinished) ws.close();
                 };
                 
                 ws.onerror = (error) => {
                     console.log('WebSocket error, falling back to polling');
                 };
+                
+                ws.onclose = () => startPolling();
             } catch (e) {
                 console.log('WebSocket not available, using polling');
+                startPolling();
             }
         }
         
@@ -778,30 +1057,36 @@ async def home():
                 const response = await fetch(`/api/crawl/${currentJobId}`);
                 const data = await response.json();
                 
-                updateProgress(data);
-                
-                if (data.status === 'completed' || data.status === 'failed') {
-                    clearInterval(statusInterval);
-                    clearInterval(timeInterval);
-                    
-                    if (data.status === 'completed') {
-                        showSuccess(data);
-                    } else {
-                        showError(`Analysis failed: ${data.error || 'Unknown error'}`);
-                    }
-                    
-                    // Reset button
-                    const btn = document.querySelector('.start-btn');
-                    btn.disabled = false;
-                    btn.innerHTML = 'Start Full Analysis';
-                }
+                handleJobState(data);
             } catch (error) {
                 console.error('Status check error:', error);
             }
         }
         
         function updateFromWebSocket(data) {
+            handleJobState(data);
+        }
+        
+        function handleJobState(data) {
+            if (jobFinished) return;
             updateProgress(data);
+            
+            if (data.status === 'completed' || data.status === 'failed') {
+                jobFinished = true;
+                stopPolling();
+                clearInterval(timeInterval);
+                
+                if (data.status === 'completed') {
+                    showSuccess(data);
+                } else {
+                    showError(`Analysis failed: ${data.error || 'Unknown error'}`);
+                }
+                
+                // Reset button
+                const btn = document.querySelector('.start-btn');
+                btn.disabled = false;
+                btn.innerHTML = 'Start Full Analysis';
+            }
         }
         
         function updateProgress(data) {
@@ -865,89 +1150,173 @@ async def home():
     </script>
 </body>
 </html>
-    """
+"""
+# Built once at import; the page is static
+_HOME_BYTES = minify_source(HOME_HTML).encode("utf-8")
+_HOME_GZIP = gzip.compress(_HOME_BYTES, compresslevel=9)
+_HOME_HEADERS = {"Cache-Control": "public, max-age=300", "Vary": "Accept-Encoding"}
+_HOME_GZIP_HEADERS = {**_HOME_HEADERS, "Content-Encoding": "gzip"}
+
+
+@app.get("/")
+async def home(request: Request):
+    """Production test interface"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=_HOME_GZIP,
+            media_type="text/html; charset=utf-8",
+            headers=_HOME_GZIP_HEADERS,
+        )
+
+    return Response(
+        content=_HOME_BYTES,
+        media_type="text/html; charset=utf-8",
+        headers=_HOME_HEADERS,
     )
 
 
+# A background thread refreshes the system sample; requests only read it
+SYSTEM_SAMPLE_INTERVAL = 1.0
+_sys_state: Dict = {"cpu_percent": 0.0, "memory_percent": 0.0}
+
+# GPU presence and size can't change while the process runs, so query the
+# driver once here rather than on every poll
+_GPU_AVAILABLE = torch.cuda.is_available()
+_GPU_TOTAL_GB = (
+    round(torch.cuda.get_device_properties(0).total_memory / 1024**3, 1)
+    if _GPU_AVAILABLE
+    else None
+)
+
+
+def _system_sampler():
+    """Refresh _sys_state forever; cpu_percent measures since the last call"""
+    while True:
+        time.sleep(SYSTEM_SAMPLE_INTERVAL)
+        _sys_state.update(
+            {
+                "cpu_percent": psutil.cpu_percent(interval=None),
+                "memory_percent": psutil.virtual_memory().percent,
+            }
+        )
+
+
+def start_system_sampler():
+    """Prime psutil's CPU counter and start the sampler thread"""
+    psutil.cpu_percent(interval=None)
+    threading.Thread(target=_system_sampler, name="system-sampler", daemon=True).start()
+
+
 @app.get("/system-status")
 async def get_system_status():
     """Get current system status"""
-    cpu_percent = psutil.cpu_percent(interval=0.1)
-    memory = psutil.virtual_memory()
-
     return {
-        "cpu_percent": cpu_percent,
-        "memory_percent": memory.percent,
-        "gpu_available": torch.cuda.is_available(),
+        **_sys_state,
+        "gpu_available": _GPU_AVAILABLE,
+        "gpu_total_gb": _GPU_TOTAL_GB,
         "models_loaded": models_loaded,
+        "crawl_jobs": sum(len(shard.jobs) for shard in crawl_job_shards),
+        "knowledge_bases": len(knowledge_bases.snapshot()),
+        "active_sessions": len(active_sessions),
+        "retrievers": len(retrievers),
     }
 
 
 @app.post("/api/crawl")
 async def start_crawl(request: CrawlRequest, background_tasks: BackgroundTasks):
     """Start crawling with full production pipeline"""
-    job_id = f"job-{datetime.utcnow().timestamp()}"
+    job_id = crawls_in_flight.get(request.domain)
+    if job_id is not None:
+        return {"job_id": job_id, "status": "started"}
 
-    with crawl_jobs_lock:
-        crawl_jobs[job_id] = {
+    job_id = f"job-{secrets.token_hex(8)}"
+    crawls_in_flight[request.domain] = job_id
+
+    shard = job_shard(job_id)
+    with shard.lock:
+        shard.jobs[job_id] = {
             "status": "started",
             "domain": request.domain,
             "max_pages": request.max_pages,
-            "started_at": datetime.utcnow().isoformat(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
             "progress": 0,
             "pages_crawled": 0,
             "chunks_created": 0,
         }
 
-    background_tasks.add_task(
-        run_full_production_pipeline, job_id, request.domain, request.max_pages
-    )
+    background_tasks.add_task(run_crawl_job, job_id, request.domain, request.max_pages)
 
     return {"job_id": job_id, "status": "started"}
 
 
+async def run_crawl_job(job_id: str, domain: str, max_pages: int):
+    """Run the pipeline once a crawl slot is free"""
+    try:
+        async with crawl_slots:
+            await run_full_production_pipeline(job_id, domain, max_pages)
+    finally:
+        crawls_in_flight.pop(domain, None)
+
+
 async def run_full_production_pipeline(job_id: str, domain: str, max_pages: int):
     """Run the COMPLETE production pipeline with all components"""
-    try:
-        # Update job status helper
-        def update_job(updates):
-            with crawl_jobs_lock:
-                if job_id in crawl_jobs:
-                    crawl_jobs[job_id].update(updates)
+    # Progress updates from the crawler and each phase share one batcher so a
+    # burst of ticks reaches WebSocket subscribers as a single message
+    updater = BatchedJobUpdater(job_id)
+    collection_name = None
 
+    try:
         # Phase 1: Crawling
         logger.info(f"Starting production crawl of {domain}")
-        update_job({"status": "crawling", "progress": 10})
-
-        crawler = ProductionCrawler(domain, max_pages, job_id)
-        pages = await crawler.start()
+        updater.update({"status": "crawling", "progress": 10})
+
+        crawler = ProductionCrawler(domain, max_pages, job_id, updater)
+
+        # Phase 2 overlaps Phase 1: each batch of crawled pages goes through
+        # multimodal processing and embedding while the crawl continues. The
+        # pages go into a collection of this job's own, so chats keep using the
+        # current knowledge base until the new one is complete
+        pages = []
+        async for batch in crawler.stream_pages(max_batch=50):
+            if knowledge_builder:
+                if collection_name is None:
+                    collection_name = knowledge_builder.create_knowledge_base(
+                        domain, version=job_id[-8:]
+                    )
+                logger.info(f"Processing {len(batch)} pages with multimodal parser")
+                await knowledge_builder.add_pages(
+                    collection_name, batch, start_index=len(pages)
+                )
+            # Only url/title/type are needed from here on; don't keep megabytes
+            # of HTML and screenshots alive for the rest of the job
+            for page in batch:
+                page.release_raw()
+            pages.extend(batch)
 
         if not pages:
             raise Exception("No pages were successfully crawled")
 
-        update_job(
-            {"pages_crawled": len(pages), "progress": 40, "status": "processing"}
+        updater.update(
+            {
+                "pages_crawled": len(pages),
+                "progress": 50,
+                "status": "building_knowledge",
+            }
         )
 
-        # Phase 2: Multimodal Processing & Knowledge Building
-        logger.info(f"Processing {len(pages)} pages with multimodal parser")
-        update_job({"status": "building_knowledge", "progress": 50})
-
         # Use the actual knowledge builder
         if knowledge_builder:
-            collection_name = await knowledge_builder.build_knowledge_base(
-                domain, pages
-            )
+            knowledge_builder.finalize_knowledge_base(collection_name, domain, pages)
 
             # Get chunk count from ChromaDB
             try:
-                chroma_client = chromadb.PersistentClient(path="./chroma_db")
-                collection = chroma_client.get_collection(collection_name)
-                chunk_count = collection.count()
-            except:
+                chunk_count = chroma_manager.get_collection(collection_name).count()
+            except (ChromaError, ValueError) as e:
+                # ValueError is what get_collection raises for a missing collection
+                logger.warning(f"Could not count chunks in {collection_name}: {e}")
                 chunk_count = len(pages) * 5  # Estimate
 
-            update_job(
+            updater.update(
                 {"chunks_created": chunk_count, "progress": 80, "status": "indexing"}
             )
         else:
@@ -955,41 +1324,65 @@ async def run_full_production_pipeline(job_id: str, domain: str, max_pages: int)
             collection_name = f"website_{domain.replace('.', '_')}"
             chunk_count = len(pages) * 5
 
-        # Store knowledge base info
-        knowledge_bases[domain] = {
-            "collection_name": collection_name,
-            "pages_count": len(pages),
-            "chunks_count": chunk_count,
-            "created_at": datetime.utcnow().isoformat(),
-            "crawler_instance": crawler,  # Keep for fallback
-        }
+        # Swap in the new knowledge base, then retire the one it replaces
+        previous = knowledge_bases.get(domain)
+        knowledge_bases.set(
+            domain,
+            {
+                "collection_name": collection_name,
+                "pages_count": len(pages),
+                "chunks_count": chunk_count,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        await asyncio.to_thread(save_knowledge_bases)
+        if previous and previous["collection_name"] != collection_name:
+            forget_retriever(previous["collection_name"])
+            if knowledge_builder:
+                await drop_collection(previous["collection_name"])
 
         # Complete
-        update_job(
+        updater.update(
             {
                 "status": "completed",
                 "progress": 100,
                 "collection_name": collection_name,
                 "chunks_created": chunk_count,
-                "completed_at": datetime.utcnow().isoformat(),
+                "completed_at": datetime.now(timezone.utc).isoformat(),
                 "domain": domain,
             }
         )
+        updater.flush()
 
         logger.info(f"✅ Full production pipeline completed for {domain}")
 
     except Exception as e:
         logger.error(f"Pipeline failed: {e}", exc_info=True)
-        update_job({"status": "failed", "error": str(e), "progress": 0})
+        # The previous knowledge base was never replaced; discard the partial one
+        current = knowledge_bases.get(domain)
+        if knowledge_builder and collection_name:
+            if not current or current["collection_name"] != collection_name:
+                await drop_collection(collection_name)
+        updater.update({"status": "failed", "error": str(e), "progress": 0})
+        updater.flush()
+
+
+async def drop_collection(collection_name: str):
+    """Delete a collection that no knowledge base points at any more"""
+    try:
+        await asyncio.to_thread(knowledge_builder.drop_knowledge_base, collection_name)
+    except Exception as e:
+        logger.warning(f"Could not delete collection {collection_name}: {e}")
 
 
 @app.get("/api/crawl/{job_id}")
 async def get_crawl_status(job_id: str):
     """Get crawl job status"""
-    with crawl_jobs_lock:
-        if job_id not in crawl_jobs:
-            raise HTTPException(status_code=404, detail="Job not found")
-        return crawl_jobs[job_id].copy()
+    job = job_shard(job_id).jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return ORJSONResponse(job)
 
 
 @app.websocket("/ws/{job_id}")
@@ -997,191 +1390,242 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
     """WebSocket for real-time updates"""
     await websocket.accept()
 
+    queue = asyncio.Queue(maxsize=16)
+    shard = job_shard(job_id)
+    with shard.lock:
+        state = shard.jobs.get(job_id)
+        shard.subscribers.setdefault(job_id, []).append(queue)
+
     try:
-        while True:
-            with crawl_jobs_lock:
-                if job_id in crawl_jobs:
-                    await websocket.send_json(crawl_jobs[job_id])
+        # Send the current state once, then only the fields that changed
+        last_sent: Dict = {}
+        while state is not None:
+            delta = {
+                k: v
+                for k, v in state.items()
+                if k not in last_sent or last_sent[k] != v
+            }
+            # Text frames keep the browser's JSON.parse(event.data) working
+            await websocket.send_text(orjson.dumps(delta).decode())
+            last_sent = state
 
-                    if crawl_jobs[job_id]["status"] in ["completed", "failed"]:
-                        break
+            if state["status"] in ["completed", "failed"]:
+                break
 
-            await asyncio.sleep(0.5)
-    except:
+            try:
+                state = await asyncio.wait_for(queue.get(), WS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # No change for a while - an empty delta doubles as a keepalive
+                state = shard.jobs.get(job_id, state)
+    except WebSocketDisconnect:
         pass
+    except asyncio.CancelledError:
+        # Let shutdown cancellation propagate after cleanup
+        raise
+    except Exception:
+        logger.exception(f"WebSocket error for job {job_id}")
     finally:
-        await websocket.close()
+        with shard.lock:
+            subscribers = shard.subscribers.get(job_id, [])
+            if queue in subscribers:
+                subscribers.remove(queue)
+            if not subscribers:
+                shard.subscribers.pop(job_id, None)
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close()
 
 
-@app.post("/api/chat")
-async def chat(request: ChatRequest):
-    """Natural conversation using full production components"""
+@dataclass(slots=True)
+class Session:
+    """One chat conversation; slotted since thousands may be held at once"""
+
+    domain: str
+    # Keep only last 10 exchanges
+    history: deque = field(default_factory=lambda: deque(maxlen=10))
+    message_count: int = 0
+
+
+def get_or_create_session(session_id: Optional[str], domain: str):
+    """Return (session_id, session), creating the session if needed"""
+    # Use provided session_id
+    if not session_id:
+        session_id = f"session-{secrets.token_hex(8)}"
+
+    # Initialize session if needed
+    if session_id not in active_sessions:
+        active_sessions[session_id] = Session(domain)
+
+    # Re-store on every message so the TTL measures idle time, not age
+    session = active_sessions[session_id]
+    active_sessions[session_id] = session
+
+    # Track message count
+    session.message_count += 1
+
+    return session_id, session
+
+
+def get_retriever(kb_info: Dict) -> Optional[OptimizedRetriever]:
+    """Return the cached retriever for a knowledge base, or None if unavailable"""
+    collection_name = kb_info["collection_name"]
+    retriever = retrievers.get(collection_name)
+    if retriever is not None:
+        return retriever
+
     try:
-        domain = request.domain
+        # Shared client, embedding function and collection cache live in
+        # chroma_manager; the BM25 index and reranker are built once here
+        retriever = OptimizedRetriever(collection_name)
+    except Exception as e:
+        logger.error(f"Failed to create retriever: {e}")
+        return None
 
-        if domain not in knowledge_bases:
-            raise HTTPException(
-                status_code=400, detail=f"Domain {domain} has not been analyzed yet"
-            )
+    retrievers[collection_name] = retriever
+    return retriever
 
-        # Get or create session - FIXED: Use provided session_id
-        session_id = request.session_id
-        if not session_id:
-            session_id = f"session-{datetime.utcnow().timestamp()}"
 
-        # Initialize session if needed
-        if session_id not in active_sessions:
-            active_sessions[session_id] = {
-                "history": [],
-                "context": {"domain": domain},
-                "user_profile": {},
-                "message_count": 0,
-            }
+def forget_retriever(collection_name: str):
+    """Drop the retriever and cached answers for a rebuilt collection"""
+    retrievers.pop(collection_name, None)
+    for key in [key for key in answer_cache if key[0] == collection_name]:
+        answer_cache.pop(key, None)
 
-        session = active_sessions[session_id]
-        kb_info = knowledge_bases[domain]
 
-        # Track message count
-        session["message_count"] += 1
+def answer_cache_key(kb_info: Dict, qctx: "QuestionCtx") -> Tuple[str, str]:
+    """Key for a question's cached answer within one knowledge base"""
+    return (kb_info["collection_name"], " ".join(qctx.lower.split()))
 
-        # Try to get retriever first
-        try:
-            # Create a fresh ChromaDB client to avoid conflicts
-            import chromadb
 
-            chroma_client = chromadb.PersistentClient(path="./chroma_db")
+def cached_answer(key: Tuple[str, str], started: float) -> Optional[ReasoningResponse]:
+    """A cached answer, timed as this request rather than the one that built it"""
+    response = answer_cache.get(key)
+    if response is not None:
+        response = replace(response, processing_time=time.time() - started)
+    return response
 
-            # Get the collection directly
-            collection = chroma_client.get_collection(
-                name=kb_info["collection_name"],
-                embedding_function=chromadb.utils.embedding_functions.SentenceTransformerEmbeddingFunction(
-                    model_name="BAAI/bge-large-en-v1.5"
-                ),
-            )
 
-            # Create retriever with the collection
-            retriever = OptimizedRetriever(kb_info["collection_name"])
-            retriever.collection = collection  # Use our collection
+async def answer_for(
+    request: ChatRequest, kb_info: Dict, session: Session, qctx: "QuestionCtx"
+) -> Dict:
+    """
+    Answer a question and record the turn in the session. Shared by /api/chat
+    and /api/chat/stream, which only differ in how they send the result.
+    """
+    started = time.time()
+    domain = request.domain
+    result = None
 
-        except Exception as e:
-            logger.error(f"Failed to create retriever: {e}")
-            retriever = None
+    # Try to get retriever first
+    retriever = get_retriever(kb_info)
 
-        # Try to use the actual reasoning engine
-        if reasoning_engine and retriever:
-            try:
+    # Try to use the actual reasoning engine
+    if reasoning_engine and retriever:
+        try:
+            cache_key = answer_cache_key(kb_info, qctx)
+            response = cached_answer(cache_key, started)
+            if response is None:
                 # Use reasoning engine for natural response
                 response = await reasoning_engine.answer_question(
                     request.question,
                     domain,  # Pass domain as context
                     retriever,
-                    session["history"],
+                    session.history,
                 )
+                # Answers drawn from the knowledge base don't depend on the
+                # conversation so far; greetings and fallbacks do
+                if response.sources:
+                    answer_cache[cache_key] = response
 
-                # Update session history
-                session["history"].append(
-                    {
-                        "question": request.question,
-                        "answer": response.answer,
-                        "timestamp": datetime.utcnow().isoformat(),
-                    }
-                )
+            result = {
+                "answer": response.answer,
+                # Only include sources if we actually used knowledge
+                "sources": response.sources if response.confidence > 0.7 else [],
+                "confidence": response.confidence,
+                "processing_time": response.processing_time,
+                "query_type": response.query_type.value,
+            }
 
-                # Keep only last 10 exchanges
-                if len(session["history"]) > 10:
-                    session["history"] = session["history"][-10:]
+        except Exception as e:
+            logger.error(f"Reasoning engine error: {e}", exc_info=True)
+            # Fall through to direct retrieval method
 
-                # Only include sources if we actually used knowledge
-                sources_to_return = (
-                    response.sources if response.confidence > 0.7 else []
-                )
+    # Fallback: Try direct retrieval if reasoning engine not available
+    if result is None and retriever:
+        try:
+            # Retrieve relevant information directly
+            retrieved_info = await retriever.retrieve(
+                request.question,
+                {"conversation_history": session.history},
+                top_k=5,
+            )
 
-                return {
-                    "answer": response.answer,
-                    "sources": sources_to_return,
-                    "confidence": response.confidence,
-                    "session_id": session_id,
-                    "processing_time": response.processing_time,
-                    "query_type": response.query_type.value,
-                }
+            # Build response from retrieved content
+            answer = await build_knowledge_based_response(
+                qctx, retrieved_info, session, domain
+            )
 
-            except Exception as e:
-                logger.error(f"Reasoning engine error: {e}", exc_info=True)
-                # Fall through to direct retrieval method
+            # Extract sources only from results that carry content
+            base_url = f"https://{domain}"
+            sources = [
+                {
+                    "url": info.metadata.get("url", base_url),
+                    "title": info.metadata.get("title", "Source"),
+                }
+                for info in retrieved_info[:3]
+                if info.metadata and info.content
+            ]
 
-        # Fallback: Try direct retrieval if reasoning engine not available
-        if retriever:
-            try:
-                # Retrieve relevant information directly
-                retrieved_info = await retriever.retrieve(
-                    request.question,
-                    {"conversation_history": session["history"]},
-                    top_k=5,
-                )
+            result = {
+                "answer": answer,
+                "sources": sources,
+                "confidence": 0.8,
+                "processing_time": 0.1,
+                "query_type": "direct_retrieval",
+            }
 
-                # Build response from retrieved content
-                answer = await build_knowledge_based_response(
-                    request.question, retrieved_info, session, domain
-                )
+        except Exception as e:
+            logger.error(f"Direct retrieval error: {e}", exc_info=True)
+
+    # Final fallback if all methods fail
+    if result is None:
+        answer = await generate_fallback_response(qctx, kb_info, session, domain)
+        result = {
+            "answer": answer,
+            "sources": [],  # No sources for fallback
+            "confidence": 0.5,
+            "processing_time": 0.1,
+            "query_type": "fallback",
+        }
+
+    # Update session history
+    session.history.append(
+        {
+            "question": request.question,
+            "answer": result["answer"],
+            "timestamp": time.time(),
+        }
+    )
 
-                # Extract sources only if we found content
-                sources = []
-                if any(info.content for info in retrieved_info):
-                    for info in retrieved_info[:3]:
-                        if info.metadata and info.content:
-                            sources.append(
-                                {
-                                    "url": info.metadata.get(
-                                        "url", f"https://{domain}"
-                                    ),
-                                    "title": info.metadata.get("title", "Source"),
-                                }
-                            )
-
-                # Update session
-                session["history"].append(
-                    {
-                        "question": request.question,
-                        "answer": answer,
-                        "timestamp": datetime.utcnow().isoformat(),
-                    }
-                )
+    return result
 
-                return {
-                    "answer": answer,
-                    "sources": sources,
-                    "confidence": 0.8,
-                    "session_id": session_id,
-                    "processing_time": 0.1,
-                    "query_type": "direct_retrieval",
-                }
 
-            except Exception as e:
-                logger.error(f"Direct retrieval error: {e}", exc_info=True)
+@app.post("/api/chat")
+async def chat(request: ChatRequest):
+    """Natural conversation using full production components"""
+    try:
+        domain = request.domain
 
-        # Final fallback if all methods fail
-        if "answer" not in locals():
-            answer = await generate_fallback_response(
-                request.question, kb_info, session, domain
+        kb_info = await lookup_knowledge_base(domain)
+        if kb_info is None:
+            raise HTTPException(
+                status_code=400, detail=f"Domain {domain} has not been analyzed yet"
             )
 
-            # Update session
-            session["history"].append(
-                {
-                    "question": request.question,
-                    "answer": answer,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            )
+        session_id, session = get_or_create_session(request.session_id, domain)
+        qctx = QuestionCtx.from_question(request.question)
 
-            return {
-                "answer": answer,
-                "sources": [],  # No sources for fallback
-                "confidence": 0.5,
-                "session_id": session_id,
-                "processing_time": 0.1,
-                "query_type": "fallback",
-            }
+        result = await answer_for(request, kb_info, session, qctx)
+        return {**result, "session_id": session_id}
 
     except HTTPException:
         raise
@@ -1190,18 +1634,72 @@ async def chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def sse_event(data: Dict) -> bytes:
+    """Format a dict as a Server-Sent Events data frame, already encoded"""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Stream the answer as Server-Sent Events, sentence by sentence"""
+    domain = request.domain
+
+    kb_info = await lookup_knowledge_base(domain)
+    if kb_info is None:
+        raise HTTPException(
+            status_code=400, detail=f"Domain {domain} has not been analyzed yet"
+        )
+
+    session_id, session = get_or_create_session(request.session_id, domain)
+    qctx = QuestionCtx.from_question(request.question)
+
+    async def event_stream():
+        try:
+            result = await answer_for(request, kb_info, session, qctx)
+            async for sentence in stream_sentences(result["answer"]):
+                yield sse_event({"type": "token", "text": sentence})
+            yield sse_event({"type": "done", "session_id": session_id, **result})
+
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}", exc_info=True)
+            yield sse_event({"type": "error", "detail": str(e)})
+
+    # Keep caches and buffering proxies from holding tokens back
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Keyword tables for the response builders, compiled once at import
+_WORD_RE = re.compile(r"\w+")
+_GREETING_WORDS = frozenset({"hi", "hello", "hey", "howdy"})
+_CONTACT_QUESTION_RE = re.compile(r"contact|phone|email|address")
+_CONTACT_CONTENT_RE = re.compile(r"contact|phone|email|address|@|call", re.I)
+
+
+@dataclass(frozen=True)
+class QuestionCtx:
+    """A question with its lowercase form and word set, computed once per request"""
+
+    raw: str
+    lower: str
+    words: FrozenSet[str]
+
+    @classmethod
+    def from_question(cls, question: str) -> "QuestionCtx":
+        lower = question.lower()
+        return cls(question, lower, frozenset(_WORD_RE.findall(lower)))
+
+
 async def build_knowledge_based_response(
-    question: str, retrieved_info: List, session: Dict, domain: str
+    qctx: QuestionCtx, retrieved_info: List, session: Session, domain: str
 ) -> str:
     """Build response using actual retrieved knowledge"""
-    import random
-
     # Check if this is a greeting (first message)
-    question_lower = question.lower()
-    is_greeting = any(
-        word in question_lower for word in ["hi", "hello", "hey", "howdy"]
-    )
-    message_count = session.get("message_count", 0)
+    is_greeting = not _GREETING_WORDS.isdisjoint(qctx.words)
+    message_count = session.message_count
 
     # Handle greetings based on conversation stage
     if is_greeting:
@@ -1214,16 +1712,18 @@ async def build_knowledge_based_response(
 
     # Extract actual content from retrieved information
     content_pieces = []
+    seen_content = set()
     for info in retrieved_info:
-        if info.content and len(info.content.strip()) > 20:
-            # Clean and add content
-            content = info.content.strip()
-            if content not in content_pieces:
+        # Clean and add content, keeping retrieval order
+        content = info.content.strip() if info.content else ""
+        if len(content) > 20:
+            if content not in seen_content:
+                seen_content.add(content)
                 content_pieces.append(content)
 
     if content_pieces:
         # We have actual content - build informative response
-        if "what" in question_lower and "about" in question_lower:
+        if "what" in qctx.words and "about" in qctx.words:
             # Question about the website
             response = f"Based on my analysis of {domain}, "
 
@@ -1239,17 +1739,13 @@ async def build_knowledge_based_response(
             if message_count <= 2:
                 response += " Is there anything specific you'd like to know more about?"
 
-        elif any(
-            word in question_lower for word in ["contact", "phone", "email", "address"]
-        ):
+        elif _CONTACT_QUESTION_RE.search(qctx.lower):
             # Looking for contact info
-            contact_content = []
-            for content in content_pieces:
-                if any(
-                    word in content.lower()
-                    for word in ["contact", "phone", "email", "address", "@", "call"]
-                ):
-                    contact_content.append(content)
+            contact_content = [
+                content
+                for content in content_pieces
+                if _CONTACT_CONTENT_RE.search(content)
+            ]
 
             if contact_content:
                 response = "Here's the contact information I found: " + " ".join(
@@ -1272,19 +1768,15 @@ async def build_knowledge_based_response(
 
 
 async def generate_fallback_response(
-    question: str, kb_info: Dict, session: Dict, domain: str
+    qctx: QuestionCtx, kb_info: Dict, session: Session, domain: str
 ) -> str:
     """Generate natural fallback response when reasoning engine unavailable"""
-    import random
-
     # Get conversation context
-    history = session.get("history", [])
-    message_count = session.get("message_count", 0)
-
-    question_lower = question.lower()
+    history = session.history
+    message_count = session.message_count
 
     # Check for greetings - only respond with greeting if it's early in conversation
-    if any(word in question_lower for word in ["hi", "hello", "hey", "howdy"]):
+    if not _GREETING_WORDS.isdisjoint(qctx.words):
         if message_count <= 1:
             return f"Hello! I'm here to help you learn about {domain}. I've analyzed {kb_info.get('pages_count', 'the')} pages and have {kb_info.get('chunks_count', 'extensive')} pieces of information ready. What would you like to know?"
         else:
@@ -1293,27 +1785,56 @@ async def generate_fallback_response(
 
     # For "what is this website about" type questions
     if (
-        "what" in question_lower and "about" in question_lower
-    ) or "tell me about" in question_lower:
+        "what" in qctx.words and "about" in qctx.words
+    ) or "tell me about" in qctx.lower:
         return f"I've analyzed {kb_info.get('pages_count', 'multiple')} pages from {domain}. The website contains {kb_info.get('chunks_count', 'various')} pieces of information. To give you the most relevant details, could you be more specific about what aspect interests you? For example, their services, contact information, or specific products?"
 
     # For specific questions when we don't have the reasoning engine
     return f"I have information from {domain} but I need to be more specific to help you best. What particular aspect would you like to know about - their services, contact details, products, or something else?"
 
 
+# The page only changes with its query string, so browsers can reuse it
+_TEST_PAGE_HEADERS = {
+    "Cache-Control": "private, max-age=300",
+    "Vary": "Accept-Encoding",
+}
+_TEST_PAGE_GZIP_HEADERS = {**_TEST_PAGE_HEADERS, "Content-Encoding": "gzip"}
+
+
 @app.get("/test-website", response_class=HTMLResponse)
-async def test_website(domain: str = "", pages: int = 0, chunks: int = 0):
+async def test_website(
+    request: Request, domain: str = "", pages: int = 0, chunks: int = 0
+):
     """Test interface with natural chat widget"""
-    if not domain or domain not in knowledge_bases:
+    if not domain or await lookup_knowledge_base(domain) is None:
         return HTMLResponse("<h1>Please analyze a domain first</h1>")
 
-    return f"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return HTMLResponse(
+            render_test_page_gzip(domain, pages, chunks),
+            headers=_TEST_PAGE_GZIP_HEADERS,
+        )
+
+    return HTMLResponse(
+        render_test_page(domain, pages, chunks), headers=_TEST_PAGE_HEADERS
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def render_test_page(domain: str, pages: int, chunks: int) -> bytes:
+    """The test page for one domain, formatted and encoded once"""
+    # Inside <script> entities aren't decoded, so the domain goes there as a JS
+    # string literal, with "<" escaped so it can't close the element
+    js_domain = orjson.dumps(domain).decode().replace("<", "\\u003c")
+    domain = html.escape(domain)
+    page = f"""
 <!DOCTYPE html>
 <html>
 <head>
     <title>Natural Chat - {domain}</title>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="preload" href="/widget/widget.js" as="script">
     <style>
         body {{
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
@@ -1401,24 +1922,33 @@ async def test_website(domain: str = "", pages: int = 0, chunks: int = 0):
     </div>
     
     <script>
-        // Configure the widget
+        // Configure the widget; widget.js itself is static and cacheable
         window.AI_CHATBOT_API_URL = "http://localhost:8000";
-        window.AI_CHATBOT_DOMAIN = "{domain}";
+        window.AI_CHATBOT_DOMAIN = {js_domain};
         window.AI_CHATBOT_AUTO_START = false;
+        // This page is only served for analyzed domains
+        window.AI_CHATBOT_DOMAIN_READY = true;
         
-        console.log('Natural chat configured for:', '{domain}');
+        console.log('Natural chat configured for:', {js_domain});
     </script>
     <script src="/widget/widget.js"></script>
 </body>
 </html>
     """
+    return minify_source(page).encode("utf-8")
 
 
-@app.get("/widget/widget.js")
-async def serve_widget():
-    """Serve the improved widget directly"""
-    # Serve the improved widget code directly instead of reading from file
-    widget_content = """(function () {
+@functools.lru_cache(maxsize=256)
+def render_test_page_gzip(domain: str, pages: int, chunks: int) -> bytes:
+    """The gzipped test page, compressed once per page"""
+    return gzip.compress(render_test_page(domain, pages, chunks), compresslevel=9)
+
+
+# The improved widget, served directly instead of reading from file. Encoded
+# once at import so every request reuses the same bytes and ETag. Per-page
+# settings (domain, API URL) come from window.AI_CHATBOT_* globals set by the
+# embedding page, so the script itself is never patched per request.
+WIDGET_JS = """(function () {
     "use strict";
 
     // Configuration
@@ -1451,6 +1981,35 @@ async def serve_widget():
         sentiment: 'neutral'
     };
 
+    // localStorage writes are synchronous I/O - coalesce them into one flush per frame
+    const persist = (() => {
+        let pending = null;
+        return (key, value) => {
+            if (!pending) {
+                pending = {};
+                requestAnimationFrame(() => {
+                    for (const [k, v] of Object.entries(pending)) localStorage.setItem(k, v);
+                    pending = null;
+                });
+            }
+            pending[key] = value;
+        };
+    })();
+
+    // Shared formatter - toLocaleTimeString builds a new one on every call
+    const timeFormatter = new Intl.DateTimeFormat([], { hour: '2-digit', minute: '2-digit' });
+
+    // Message bubbles kept in the DOM; older ones are rebuilt from history on demand
+    const MAX_RENDERED_MESSAGES = 50;
+    // Streamed tokens are painted in batches at most this often
+    const TOKEN_FLUSH_MS = 80;
+    // How long a successful domain check is trusted across page loads in this tab
+    const READY_CACHE_MS = 5 * 60 * 1000;
+
+    // Sentiment keywords, matched as whole words
+    const POSITIVE_RE = /\\b(?:thanks|great|awesome|perfect|excellent|good)\\b/i;
+    const NEGATIVE_RE = /\\b(?:bad|wrong|incorrect|unhappy|disappointed)\\b/i;
+
     // Create widget HTML with improved design
     const widgetHTML = `
         <div id="ai-chatbot-container" class="ai-chatbot-container ai-chatbot-${config.position}">
@@ -1493,6 +2052,7 @@ async def serve_widget():
                             <span>Checking knowledge base...</span>
                         </div>
                     </div>
+                    <div id="ai-chatbot-scroll-anchor"></div>
                 </div>
                 
 
@@ -1529,17 +2089,33 @@ async def serve_widget():
                 <span class="ai-chatbot-trigger-pulse"></span>
                 <span class="ai-chatbot-badge" id="ai-chatbot-badge" style="display: none;">1</span>
             </button>
+            
+            <template id="ai-chatbot-typing-tpl">
+                <div class="ai-chatbot-message-avatar">AI</div>
+                <div class="ai-chatbot-message-content">
+                    <div class="ai-chatbot-typing"><span></span><span></span><span></span></div>
+                </div>
+            </template>
+            <template id="ai-chatbot-message-tpl">
+                <div class="ai-chatbot-message"><div class="ai-chatbot-message-avatar"></div><div class="ai-chatbot-message-content"><p class="ai-chatbot-message-text"></p><div class="ai-chatbot-message-time"></div></div></div>
+            </template>
         </div>
     `;
 
     // Enhanced styles with better animations and natural feel
-    const styles = `
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap');
+    const cssText = `
+            :host {
+                --brand-grad: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            }
             
             .ai-chatbot-container {
                 position: fixed;
                 z-index: 999999;
+                /* No paint containment here - it would clip the children's shadows */
+                contain: layout style;
+                /* Own compositor layer so host-page scrolling never repaints the widget */
+                transform: translateZ(0);
+                backface-visibility: hidden;
                 font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             }
             
@@ -1559,6 +2135,8 @@ async def serve_widget():
                 overflow: hidden;
                 transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
                 transform-origin: bottom right;
+                transform: translateZ(0);
+                contain: content;
             }
             
             .ai-chatbot-widget.ai-chatbot-hidden {
@@ -1572,7 +2150,7 @@ async def serve_widget():
             }
             
             .ai-chatbot-header {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                background: var(--brand-grad);
                 color: white;
                 padding: 18px 20px;
                 flex-shrink: 0;
@@ -1654,7 +2232,9 @@ async def serve_widget():
                 overflow-y: auto;
                 padding: 20px;
                 background: #f8f9fb;
-                scroll-behavior: smooth;
+                /* Smoothness is chosen per scroll call, see scrollToBottom */
+                scroll-behavior: auto;
+                contain: layout paint style;
             }
             
             .ai-chatbot-messages::-webkit-scrollbar {
@@ -1679,13 +2259,14 @@ async def serve_widget():
                 width: 80px;
                 height: 80px;
                 margin: 0 auto 20px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                background: var(--brand-grad);
                 border-radius: 50%;
                 display: flex;
                 align-items: center;
                 justify-content: center;
                 color: white;
                 animation: float 3s ease-in-out infinite;
+                will-change: transform;
             }
             
             @keyframes float {
@@ -1723,6 +2304,7 @@ async def serve_widget():
                 border-top-color: #667eea;
                 border-radius: 50%;
                 animation: spin 1s linear infinite;
+                will-change: transform;
             }
             
             @keyframes spin {
@@ -1730,10 +2312,29 @@ async def serve_widget():
             }
             
             .ai-chatbot-message {
-                margin-bottom: 20px;
+                /* Padding instead of margin so the bubble shadow stays inside the
+                   paint containment implied by content-visibility */
+                padding: 8px 0 12px;
                 display: flex;
                 gap: 12px;
                 animation: messageSlide 0.3s ease-out;
+                contain: layout style;
+                content-visibility: auto;
+                contain-intrinsic-size: auto 80px;
+            }
+            
+            .ai-chatbot-message-live {
+                content-visibility: visible;
+            }
+            
+            /* Sent but not yet answered, see sendMessage */
+            .ai-chatbot-message-pending .ai-chatbot-message-content {
+                opacity: 0.6;
+            }
+            
+            /* Promoted only for the entrance animation, see addMessage */
+            .ai-chatbot-message-entering {
+                will-change: transform, opacity;
             }
             
             @keyframes messageSlide {
@@ -1755,7 +2356,7 @@ async def serve_widget():
                 width: 36px;
                 height: 36px;
                 border-radius: 10px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                background: var(--brand-grad);
                 color: white;
                 display: flex;
                 align-items: center;
@@ -1776,10 +2377,11 @@ async def serve_widget():
                 border-radius: 18px;
                 box-shadow: 0 2px 8px rgba(0,0,0,0.06);
                 position: relative;
+                contain: layout paint style;
             }
             
             .ai-chatbot-message-user .ai-chatbot-message-content {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                background: var(--brand-grad);
                 color: white;
             }
             
@@ -1833,6 +2435,22 @@ async def serve_widget():
                 transform: translateY(-1px);
             }
             
+            .ai-chatbot-load-earlier {
+                display: block;
+                margin: 0 auto 12px;
+                padding: 6px 12px;
+                font-size: 12px;
+                color: #667eea;
+                background: rgba(102, 126, 234, 0.1);
+                border: none;
+                border-radius: 6px;
+                cursor: pointer;
+            }
+            
+            .ai-chatbot-load-earlier[hidden] {
+                display: none;
+            }
+            
             .ai-chatbot-input-container {
                 padding: 20px;
                 background: white;
@@ -1873,7 +2491,7 @@ async def serve_widget():
             .ai-chatbot-send {
                 width: 48px;
                 height: 48px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                background: var(--brand-grad);
                 color: white;
                 border: none;
                 border-radius: 14px;
@@ -1881,13 +2499,42 @@ async def serve_widget():
                 display: flex;
                 align-items: center;
                 justify-content: center;
-                transition: all 0.2s;
+                transition: transform 0.2s;
+                position: relative;
+            }
+            
+            /* Both shadow states are pre-rendered layers cross-faded with opacity,
+               so hovering never repaints box-shadow */
+            .ai-chatbot-send::before,
+            .ai-chatbot-send::after {
+                content: '';
+                position: absolute;
+                inset: 0;
+                border-radius: inherit;
+                transition: opacity 0.2s;
+                pointer-events: none;
+            }
+            
+            .ai-chatbot-send::before {
                 box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3);
             }
             
+            .ai-chatbot-send::after {
+                box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
+                opacity: 0;
+            }
+            
             .ai-chatbot-send:hover:not(:disabled) {
                 transform: translateY(-2px);
-                box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
+            }
+            
+            .ai-chatbot-send:hover:not(:disabled)::before,
+            .ai-chatbot-send:disabled::before {
+                opacity: 0;
+            }
+            
+            .ai-chatbot-send:hover:not(:disabled)::after {
+                opacity: 1;
             }
             
             .ai-chatbot-send:active:not(:disabled) {
@@ -1897,7 +2544,6 @@ async def serve_widget():
             .ai-chatbot-send:disabled {
                 background: #9ca3af;
                 cursor: not-allowed;
-                box-shadow: none;
             }
             
             .ai-chatbot-input-hint {
@@ -1910,7 +2556,7 @@ async def serve_widget():
             .ai-chatbot-trigger {
                 width: 64px;
                 height: 64px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                background: var(--brand-grad);
                 border: none;
                 border-radius: 50%;
                 color: white;
@@ -1919,14 +2565,16 @@ async def serve_widget():
                 align-items: center;
                 justify-content: center;
                 box-shadow: 0 6px 24px rgba(102, 126, 234, 0.4);
-                transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+                transition: transform 0.3s cubic-bezier(0.4, 0, 0.2, 1);
                 position: relative;
                 overflow: hidden;
+                contain: layout paint;
+                transform: translateZ(0);
             }
             
+            /* Shadow stays static: overflow and paint containment would clip pseudo layers */
             .ai-chatbot-trigger:hover {
                 transform: translateY(-2px) scale(1.05);
-                box-shadow: 0 8px 32px rgba(102, 126, 234, 0.5);
             }
             
             .ai-chatbot-trigger-pulse {
@@ -1936,6 +2584,7 @@ async def serve_widget():
                 background: radial-gradient(circle, rgba(255,255,255,0.4) 0%, transparent 70%);
                 border-radius: 50%;
                 animation: triggerPulse 2s infinite;
+                will-change: transform, opacity;
             }
             
             @keyframes triggerPulse {
@@ -1969,6 +2618,7 @@ async def serve_widget():
                 padding: 0 6px;
                 box-shadow: 0 2px 8px rgba(239, 68, 68, 0.4);
                 animation: badgeBounce 0.5s ease-out;
+                will-change: transform;
             }
             
             @keyframes badgeBounce {
@@ -1990,6 +2640,7 @@ async def serve_widget():
                 background: #667eea;
                 border-radius: 50%;
                 animation: typing 1.4s ease-in-out infinite;
+                will-change: transform;
             }
             
             .ai-chatbot-typing span:nth-child(2) {
@@ -2011,6 +2662,22 @@ async def serve_widget():
                 }
             }
             
+            @media (prefers-reduced-motion: reduce) {
+                .ai-chatbot-avatar-large,
+                .ai-chatbot-trigger-pulse,
+                .ai-chatbot-spinner,
+                .ai-chatbot-status-dot,
+                .ai-chatbot-typing span,
+                .ai-chatbot-message {
+                    animation: none !important;
+                }
+                
+                .ai-chatbot-widget,
+                .ai-chatbot-message {
+                    transition-duration: 0.01ms !important;
+                }
+            }
+            
             @media (max-width: 480px) {
                 .ai-chatbot-widget {
                     width: 100vw;
@@ -2029,12 +2696,34 @@ async def serve_widget():
                     right: 20px;
                 }
             }
-        </style>
     `;
 
-    // Inject HTML and styles
-    document.head.insertAdjacentHTML("beforeend", styles);
-    document.body.insertAdjacentHTML("beforeend", widgetHTML);
+    // Shadow root holding the widget, created by mountWidget()
+    let root = null;
+
+    function mountWidget() {
+        // Constructed stylesheets can't @import, so the web font is linked from the page
+        const fontLink = document.createElement("link");
+        fontLink.rel = "stylesheet";
+        fontLink.href = "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap";
+        document.head.appendChild(fontLink);
+
+        // Render into a shadow root so host-page style recalc never matches widget selectors
+        const host = document.createElement("div");
+        host.id = "ai-chatbot-host";
+        document.body.appendChild(host);
+        root = host.attachShadow({ mode: "open" });
+        root.innerHTML = widgetHTML;
+        if ("adoptedStyleSheets" in ShadowRoot.prototype && "replaceSync" in CSSStyleSheet.prototype) {
+            const sheet = new CSSStyleSheet();
+            sheet.replaceSync(cssText);
+            root.adoptedStyleSheets = [sheet];
+        } else {
+            const style = document.createElement("style");
+            style.textContent = cssText;
+            root.appendChild(style);
+        }
+    }
 
     // API class with improved error handling
     class ChatbotAPI {
@@ -2042,13 +2731,19 @@ async def serve_widget():
             this.apiUrl = apiUrl;
             this.retryCount = 3;
             this.retryDelay = 1000;
+            this.probeTimeout = 10000;
         }
 
-        async request(url, options = {}) {
-            for (let i = 0; i < this.retryCount; i++) {
+        // timeout is opt-in: a slow chat answer must still be allowed to land
+        async request(url, options = {}, { readBody = true, timeout = 0, retries = this.retryCount } = {}) {
+            for (let i = 0; i < retries; i++) {
+                // Fresh controller per attempt so a hung attempt releases its socket
+                const controller = new AbortController();
+                const timer = timeout ? setTimeout(() => controller.abort(), timeout) : 0;
                 try {
                     const response = await fetch(url, {
                         ...options,
+                        signal: controller.signal,
                         headers: {
                             'Content-Type': 'application/json',
                             ...options.headers
@@ -2060,10 +2755,19 @@ async def serve_widget():
                         throw new Error(error.detail || `HTTP ${response.status}`);
                     }
 
-                    return response.json();
+                    if (!readBody) {
+                        // Only the status matters - drop the body unread
+                        controller.abort();
+                        return true;
+                    }
+                    return await response.json();
                 } catch (error) {
-                    if (i === this.retryCount - 1) throw error;
-                    await new Promise(resolve => setTimeout(resolve, this.retryDelay * (i + 1)));
+                    if (i === retries - 1) throw error;
+                    // Exponential backoff with jitter so clients don't retry in lockstep
+                    const delay = this.retryDelay * 2 ** i + Math.random() * 200;
+                    await new Promise(resolve => setTimeout(resolve, delay));
+                } finally {
+                    clearTimeout(timer);
                 }
             }
         }
@@ -2077,7 +2781,7 @@ async def serve_widget():
                         domain: domain,
                         session_id: "test-session"
                     })
-                });
+                }, { readBody: false, timeout: this.probeTimeout });
                 return true;
             } catch (error) {
                 return false;
@@ -2085,6 +2789,7 @@ async def serve_widget():
         }
 
         async sendMessage(question, sessionId, domain) {
+            // A chat POST isn't idempotent, so it is never resent
             return this.request(`${this.apiUrl}/api/chat`, {
                 method: 'POST',
                 body: JSON.stringify({
@@ -2093,7 +2798,48 @@ async def serve_widget():
                     domain: domain,
                     require_reasoning: true
                 })
+            }, { retries: 1 });
+        }
+
+        async streamMessage(question, sessionId, domain, onToken) {
+            // Server-Sent Events read off the fetch body; resolves with the "done" event
+            const response = await fetch(`${this.apiUrl}/api/chat/stream`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    question,
+                    session_id: sessionId,
+                    domain: domain,
+                    require_reasoning: true
+                })
             });
+            if (!response.ok || !response.body) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+            let buffer = '';
+            for (;;) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += value;
+                let end;
+                while ((end = buffer.indexOf('\\n\\n')) !== -1) {
+                    const frame = buffer.slice(0, end);
+                    buffer = buffer.slice(end + 2);
+                    if (!frame.startsWith('data: ')) continue;
+                    const event = JSON.parse(frame.slice(6));
+                    if (event.type === 'token') {
+                        onToken(event.text);
+                    } else if (event.type === 'done') {
+                        reader.cancel();
+                        return event;
+                    } else if (event.type === 'error') {
+                        throw new Error(event.detail);
+                    }
+                }
+            }
+            throw new Error('Stream ended without a reply');
         }
     }
 
@@ -2103,13 +2849,33 @@ async def serve_widget():
     // Main chatbot class with enhanced functionality
     class AIChatbot {
         constructor() {
-            this.widget = document.getElementById("ai-chatbot-widget");
-            this.trigger = document.getElementById("ai-chatbot-trigger");
-            this.messages = document.getElementById("ai-chatbot-messages");
-            this.input = document.getElementById("ai-chatbot-input");
-            this.sendButton = document.getElementById("ai-chatbot-send");
-            this.badge = document.getElementById("ai-chatbot-badge");
+            this.widget = root.getElementById("ai-chatbot-widget");
+            this.trigger = root.getElementById("ai-chatbot-trigger");
+            this.messages = root.getElementById("ai-chatbot-messages");
+            this.input = root.getElementById("ai-chatbot-input");
+            this.sendButton = root.getElementById("ai-chatbot-send");
+            this.badge = root.getElementById("ai-chatbot-badge");
+            this.scrollAnchor = root.getElementById("ai-chatbot-scroll-anchor");
+            this.welcomeEl = root.getElementById("ai-chatbot-welcome");
+            this.loadingEl = root.getElementById("ai-chatbot-loading");
+            this.statusEl = root.querySelector(".ai-chatbot-status-detail");
+            this.pulse = root.querySelector(".ai-chatbot-trigger-pulse");
+            this.typingTpl = root.getElementById("ai-chatbot-typing-tpl").content;
+            this.messageTpl = root.getElementById("ai-chatbot-message-tpl").content.firstElementChild;
             this.domain = config.domain;
+            this.liveMessage = null;
+            this._resizeScheduled = false;
+            this._sendDisabled = null;
+            this._scrollPending = false;
+            this._lastStoredSid = sessionId;
+            this.history = [];
+            this.firstRendered = 0;
+            this.loadEarlierButton = null;
+            this._lastEnterSend = -Infinity;
+            this._sendQueue = Promise.resolve();
+            this._queuedMessages = new Set();
+            this.typingNode = null;
+            this._typingRemoval = null;
             
             this.init();
         }
@@ -2119,19 +2885,23 @@ async def serve_widget():
             
             // Setup event listeners
             this.setupEventListeners();
+            this.setupPulsePausing();
+            this.setupAutoScroll();
             
             // Check domain status
             await this.checkDomainStatus();
-            
-            // Setup auto-resize for textarea
-            this.setupAutoResize();
         }
 
         setupEventListeners() {
             // Input handling
-            this.input.addEventListener("keypress", (e) => {
+            this.input.addEventListener("keydown", (e) => {
+                // Enter that commits an IME composition must not send
+                if (e.isComposing || e.keyCode === 229) return;
                 if (e.key === "Enter" && !e.shiftKey) {
                     e.preventDefault();
+                    // A held or double-tapped Enter sends once
+                    if (e.repeat || e.timeStamp - this._lastEnterSend < 400) return;
+                    this._lastEnterSend = e.timeStamp;
                     this.sendMessage();
                 }
             });
@@ -2141,38 +2911,85 @@ async def serve_widget():
                 this.updateSendButtonState();
             });
 
-            // Focus input when clicking messages area
+            // One delegated handler for everything inside the messages area
             this.messages.addEventListener("click", (e) => {
+                const source = e.target.closest(".ai-chatbot-message-source");
+                if (source) {
+                    this.trackEvent('source_clicked', { url: source.href });
+                    return;
+                }
+                if (e.target === this.loadEarlierButton) {
+                    this.loadEarlier();
+                    return;
+                }
+                // Focus input when clicking messages area
                 if (e.target === this.messages && isReady) {
                     this.input.focus();
                 }
-            });
+            }, { passive: true });
         }
 
-        setupAutoResize() {
-            const resize = () => {
-                this.input.style.height = 'auto';
-                this.input.style.height = Math.min(this.input.scrollHeight, 120) + 'px';
+        setupPulsePausing() {
+            // Stop the perpetual trigger pulse while nobody can see it
+            let triggerVisible = true;
+            const update = () => {
+                const running = triggerVisible && !document.hidden;
+                this.pulse.style.animationPlayState = running ? "running" : "paused";
             };
-            this.input.addEventListener('input', resize);
+            if ("IntersectionObserver" in window) {
+                new IntersectionObserver(([entry]) => {
+                    triggerVisible = entry.isIntersecting;
+                    update();
+                }, { threshold: 0 }).observe(this.trigger);
+            }
+            document.addEventListener("visibilitychange", update);
+        }
+
+        setupAutoScroll() {
+            // Follow new messages only while the reader is at the bottom
+            this._pinned = true;
+            if ("IntersectionObserver" in window) {
+                new IntersectionObserver(([entry]) => {
+                    this._pinned = entry.isIntersecting;
+                }, { root: this.messages, rootMargin: "0px 0px 48px 0px" }).observe(this.scrollAnchor);
+            }
         }
 
         adjustTextareaHeight() {
-            this.input.style.height = 'auto';
-            this.input.style.height = Math.min(this.input.scrollHeight, 120) + 'px';
+            // One read/write pair per frame, after the current event's work
+            if (this._resizeScheduled) return;
+            this._resizeScheduled = true;
+            requestAnimationFrame(() => {
+                this._resizeScheduled = false;
+                const el = this.input;
+                el.style.height = 'auto';
+                el.style.height = Math.min(el.scrollHeight, 120) + 'px';
+            });
         }
 
         updateSendButtonState() {
             const hasText = this.input.value.trim().length > 0;
-            this.sendButton.disabled = !hasText || !isReady;
+            const disabled = !hasText || !isReady;
+            // Skip same-value writes, they still invalidate the button's style
+            if (disabled === this._sendDisabled) return;
+            this._sendDisabled = disabled;
+            this.sendButton.disabled = disabled;
         }
 
         async checkDomainStatus() {
             try {
-                const statusElement = document.querySelector('.ai-chatbot-status-detail');
-                statusElement.textContent = 'Connecting...';
+                this.statusEl.textContent = 'Connecting...';
                 
-                const ready = await api.checkDomainReady(this.domain);
+                // The embedding page or a fresh "ready" verdict from this tab
+                // skips the round trip
+                const cacheKey = `ai_chatbot_ready:${this.domain}`;
+                const readyAt = Number(sessionStorage.getItem(cacheKey));
+                let ready = window.AI_CHATBOT_DOMAIN_READY === true
+                    || Date.now() - readyAt < READY_CACHE_MS;
+                if (!ready) {
+                    ready = await api.checkDomainReady(this.domain);
+                    if (ready) sessionStorage.setItem(cacheKey, String(Date.now()));
+                }
                 
                 if (ready) {
                     console.log("✅ Domain ready for chat");
@@ -2189,15 +3006,15 @@ async def serve_widget():
 
         onReady() {
             isReady = true;
-            this.input.disabled = false;
-            this.input.placeholder = "Type your message...";
-            
-            const statusElement = document.querySelector('.ai-chatbot-status-detail');
-            statusElement.textContent = 'Online';
             
-            // Clear loading state
-            const loading = document.getElementById("ai-chatbot-loading");
-            if (loading) loading.style.display = 'none';
+            // Apply every ready-state write in one frame
+            requestAnimationFrame(() => {
+                this.input.disabled = false;
+                this.input.placeholder = "Type your message...";
+                this.statusEl.textContent = 'Online';
+                // Clear loading state
+                if (this.loadingEl) this.loadingEl.style.display = 'none';
+            });
             
             // Show welcome message after a delay
             setTimeout(() => {
@@ -2208,8 +3025,7 @@ async def serve_widget():
         }
 
         showWelcomeMessage() {
-            const welcome = document.getElementById("ai-chatbot-welcome");
-            if (welcome) welcome.style.display = 'none';
+            if (this.welcomeEl) this.welcomeEl.style.display = 'none';
             
             this.addMessage(
                 "bot", 
@@ -2220,9 +3036,8 @@ async def serve_widget():
         }
 
         showError(message) {
-            const loading = document.getElementById("ai-chatbot-loading");
-            if (loading) {
-                loading.innerHTML = `<span style="color: #ef4444;">${message}</span>`;
+            if (this.loadingEl) {
+                this.loadingEl.innerHTML = `<span style="color: #ef4444;">${message}</span>`;
             }
         }
 
@@ -2234,8 +3049,17 @@ async def serve_widget():
             }
         }
 
+        promoteForTransition() {
+            // will-change only while the open/close transition runs
+            this.widget.style.willChange = "transform, opacity";
+            this.widget.addEventListener("transitionend", () => {
+                this.widget.style.willChange = "";
+            }, { once: true });
+        }
+
         open() {
             isOpen = true;
+            this.promoteForTransition();
             this.widget.classList.remove("ai-chatbot-hidden");
             this.trigger.style.display = "none";
             this.hideBadge();
@@ -2250,6 +3074,7 @@ async def serve_widget():
 
         close() {
             isOpen = false;
+            this.promoteForTransition();
             this.widget.classList.add("ai-chatbot-hidden");
             this.trigger.style.display = "flex";
             
@@ -2271,55 +3096,106 @@ async def serve_widget():
             this.badge.style.display = "none";
         }
 
-        async sendMessage() {
+        sendMessage() {
             const message = this.input.value.trim();
             
             if (!message || !isReady) return;
             
+            // The same text sent again while it is still waiting is a duplicate;
+            // leave it in the input so it can be sent once the first one lands
+            if (this._queuedMessages.has(message)) return;
+            this._queuedMessages.add(message);
+            
             // Clear input immediately
             this.input.value = "";
             this.adjustTextareaHeight();
             this.updateSendButtonState();
             
-            // Add user message
-            this.addMessage("user", message);
+            // Add user message optimistically; it stays pending until the reply lands
+            const sent = this.addMessage("user", message);
+            sent.node.classList.add("ai-chatbot-message-pending");
             
             // Update context
             messageCount++;
+            
+            // One request in flight at a time; later messages wait their turn
+            this._sendQueue = this._sendQueue
+                .then(() => this.deliver(message, sent))
+                .catch(error => console.error("Failed to send message:", error))
+                .finally(() => this._queuedMessages.delete(message));
+            return this._sendQueue;
+        }
+
+        async deliver(message, sent) {
             lastMessageTime = Date.now();
             
-            // Show typing indicator with dynamic duration
-            const typingDuration = this.calculateTypingDuration(message);
-            const typingId = this.showTyping();
+            // Start the request before touching the DOM again; the reply is rendered
+            // as it streams in
+            const reply = { record: null, buffer: '', timer: null, typingNode: null };
+            const request = api.streamMessage(
+                message, sessionId, this.domain, text => this.onReplyToken(reply, text)
+            );
+            
+            // Show typing indicator
+            reply.typingNode = this.showTyping();
             
             try {
-                // Send to API with consistent session ID
-                const response = await api.sendMessage(message, sessionId, this.domain);
+                // Sent with consistent session ID
+                let response;
+                try {
+                    response = await request;
+                } catch (error) {
+                    // Nothing shown yet, so the plain JSON endpoint can still answer
+                    if (reply.record) throw error;
+                    console.warn("Streaming failed, retrying without it:", error);
+                    response = await api.sendMessage(message, sessionId, this.domain);
+                }
+                if (sent.node) sent.node.classList.remove("ai-chatbot-message-pending");
                 
                 // Store session ID
                 if (response.session_id) {
                     sessionId = response.session_id;
-                    localStorage.setItem("ai_chatbot_session", sessionId);
+                    if (sessionId !== this._lastStoredSid) {
+                        this._lastStoredSid = sessionId;
+                        persist("ai_chatbot_session", sessionId);
+                    }
                 }
                 
-                // Simulate natural typing delay
-                const remainingDelay = typingDuration - (Date.now() - lastMessageTime);
-                if (remainingDelay > 0) {
-                    await new Promise(resolve => setTimeout(resolve, remainingDelay));
+                if (reply.record) {
+                    this.finishReply(reply, response);
+                } else {
+                    // Simulate natural typing delay, only if the request didn't already cover it
+                    const elapsed = Date.now() - lastMessageTime;
+                    if (elapsed < config.typingSpeed) {
+                        await new Promise(resolve => setTimeout(resolve, config.typingSpeed - elapsed));
+                    }
+                    
+                    // Remove typing indicator
+                    this.removeTyping(reply.typingNode);
+                    
+                    // Add bot response
+                    this.addMessage("bot", response.answer, response.sources);
                 }
                 
-                // Remove typing indicator
-                this.removeTyping(typingId);
-                
-                // Add bot response
-                this.addMessage("bot", response.answer, response.sources);
-                
                 // Update conversation context
                 this.updateConversationContext(message, response);
                 
             } catch (error) {
                 console.error("Failed to send message:", error);
-                this.removeTyping(typingId);
+                this.removeTyping(reply.typingNode);
+                if (reply.record) {
+                    // Keep the part of the answer that did arrive
+                    this.flushReply(reply);
+                    if (sent.node) sent.node.classList.remove("ai-chatbot-message-pending");
+                } else {
+                    // Roll back the undelivered message and hand its text back for a retry
+                    this.removeMessage(sent);
+                    if (!this.input.value) {
+                        this.input.value = message;
+                        this.adjustTextareaHeight();
+                        this.updateSendButtonState();
+                    }
+                }
                 this.addMessage(
                     "bot", 
                     "I apologize, but I'm having trouble connecting right now. Please try again in a moment, or check your internet connection."
@@ -2327,23 +3203,50 @@ async def serve_widget():
             }
         }
 
-        calculateTypingDuration(message) {
-            // Simulate natural typing speed based on message length
-            const wordsPerMinute = 300;
-            const words = message.split(' ').length;
-            const baseTime = (words / wordsPerMinute) * 60 * 1000;
-            return Math.max(config.typingSpeed, Math.min(baseTime, 3000));
+        onReplyToken(reply, text) {
+            if (!reply.record) {
+                this.removeTyping(reply.typingNode);
+                reply.record = this.addMessage("bot", "");
+            }
+            // Tokens arrive far faster than is worth painting - flush them in batches
+            reply.buffer += text;
+            if (!reply.timer) {
+                reply.timer = setTimeout(() => this.flushReply(reply), TOKEN_FLUSH_MS);
+            }
+        }
+
+        flushReply(reply) {
+            clearTimeout(reply.timer);
+            reply.timer = null;
+            if (!reply.buffer) return;
+            const record = reply.record;
+            record.text += reply.buffer;
+            reply.buffer = '';
+            // One text write per batch
+            if (record.node) record.textEl.textContent = record.text;
+            this.scrollToBottom('auto');
+        }
+
+        finishReply(reply, response) {
+            this.flushReply(reply);
+            const record = reply.record;
+            // The done event carries the full answer, which is authoritative
+            if (response.answer && response.answer !== record.text) {
+                record.text = response.answer;
+                if (record.node) record.textEl.textContent = record.text;
+            }
+            if (response.sources && response.sources.length > 0) {
+                record.sources = response.sources;
+                if (record.node) record.contentEl.appendChild(this.buildSources(record.sources));
+            }
+            this.scrollToBottom();
         }
 
         updateConversationContext(userMessage, response) {
             // Analyze sentiment
-            const positiveSentiments = ['thanks', 'great', 'awesome', 'perfect', 'excellent', 'good'];
-            const negativeSentiments = ['bad', 'wrong', 'incorrect', 'unhappy', 'disappointed'];
-            
-            const messageLower = userMessage.toLowerCase();
-            if (positiveSentiments.some(word => messageLower.includes(word))) {
+            if (POSITIVE_RE.test(userMessage)) {
                 conversationContext.sentiment = 'positive';
-            } else if (negativeSentiments.some(word => messageLower.includes(word))) {
+            } else if (NEGATIVE_RE.test(userMessage)) {
                 conversationContext.sentiment = 'negative';
             }
             
@@ -2354,93 +3257,167 @@ async def serve_widget():
         }
 
         addMessage(sender, text, sources = []) {
-            const messageDiv = document.createElement("div");
-            messageDiv.className = `ai-chatbot-message ai-chatbot-message-${sender}`;
+            const record = { sender, text, sources, time: timeFormatter.format(new Date()), node: null };
+            this.history.push(record);
+            const messageDiv = this.buildMessage(record);
+            
+            // Only the newest message is always rendered; older ones may be skipped off-screen
+            if (this.liveMessage) {
+                this.liveMessage.classList.remove("ai-chatbot-message-live");
+            }
+            messageDiv.classList.add("ai-chatbot-message-live");
+            this.liveMessage = messageDiv;
+            
+            // Release the GPU layer once the entrance animation is done
+            messageDiv.classList.add("ai-chatbot-message-entering");
+            messageDiv.addEventListener("animationend", () => {
+                messageDiv.classList.remove("ai-chatbot-message-entering");
+            }, { once: true });
+            
+            // New nodes always go before the scroll anchor
+            this.messages.insertBefore(messageDiv, this.scrollAnchor);
+            this.trimRendered();
+            // The user's own message always brings the view back down
+            this.scrollToBottom('smooth', sender === "user");
+            return record;
+        }
+
+        removeMessage(record) {
+            const index = this.history.indexOf(record);
+            if (index === -1) return;
+            this.history.splice(index, 1);
+            if (index < this.firstRendered) this.firstRendered--;
+            if (record.node) record.node.remove();
+            this.updateLoadEarlier();
+        }
+
+        buildMessage(record) {
+            const { sender, text, sources } = record;
+            // Clone the parsed skeleton and fill in only what differs per message
+            const messageDiv = this.messageTpl.cloneNode(true);
+            messageDiv.classList.add(`ai-chatbot-message-${sender}`);
+            const [avatar, content] = messageDiv.children;
+            const [textP, time] = content.children;
             
-            const avatar = document.createElement("div");
-            avatar.className = "ai-chatbot-message-avatar";
             avatar.textContent = sender === "user" ? "You" : "AI";
-            
-            const content = document.createElement("div");
-            content.className = "ai-chatbot-message-content";
-            
-            const textP = document.createElement("p");
-            textP.className = "ai-chatbot-message-text";
             textP.textContent = text;
-            content.appendChild(textP);
             
             // Add timestamp
-            const time = document.createElement("div");
-            time.className = "ai-chatbot-message-time";
-            time.textContent = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
-            content.appendChild(time);
+            time.textContent = record.time;
             
             // Add sources if available
             if (sources && sources.length > 0) {
-                const sourcesDiv = document.createElement("div");
-                sourcesDiv.className = "ai-chatbot-message-sources";
-                
-                const sourcesTitle = document.createElement("div");
-                sourcesTitle.className = "ai-chatbot-message-sources-title";
-                sourcesTitle.textContent = "📎 Sources:";
-                sourcesDiv.appendChild(sourcesTitle);
-                
-                sources.forEach(source => {
-                    if (source && source.url) {
-                        const sourceLink = document.createElement("a");
-                        sourceLink.className = "ai-chatbot-message-source";
-                        sourceLink.href = source.url;
-                        sourceLink.textContent = source.title || "View source";
-                        sourceLink.target = "_blank";
-                        sourceLink.rel = "noopener noreferrer";
-                        sourcesDiv.appendChild(sourceLink);
-                    }
-                });
-                
-                content.appendChild(sourcesDiv);
+                content.appendChild(this.buildSources(sources));
+            }
+            
+            // The subtree is built off-DOM and attached by the caller in one insert
+            record.node = messageDiv;
+            record.textEl = textP;
+            record.contentEl = content;
+            return messageDiv;
+        }
+
+        buildSources(sources) {
+            const sourcesDiv = document.createElement("div");
+            sourcesDiv.className = "ai-chatbot-message-sources";
+            
+            const sourcesTitle = document.createElement("div");
+            sourcesTitle.className = "ai-chatbot-message-sources-title";
+            sourcesTitle.textContent = "📎 Sources:";
+            sourcesDiv.appendChild(sourcesTitle);
+            
+            const sourceLinks = document.createDocumentFragment();
+            sources.forEach(source => {
+                if (source && source.url) {
+                    const sourceLink = document.createElement("a");
+                    sourceLink.className = "ai-chatbot-message-source";
+                    sourceLink.href = source.url;
+                    sourceLink.textContent = source.title || "View source";
+                    sourceLink.target = "_blank";
+                    sourceLink.rel = "noopener noreferrer";
+                    sourceLinks.appendChild(sourceLink);
+                }
+            });
+            sourcesDiv.appendChild(sourceLinks);
+            return sourcesDiv;
+        }
+
+        trimRendered() {
+            // Keep the DOM bounded; dropped bubbles stay in this.history
+            while (this.history.length - this.firstRendered > MAX_RENDERED_MESSAGES) {
+                const record = this.history[this.firstRendered++];
+                record.node.remove();
+                record.node = null;
             }
-            
-            messageDiv.appendChild(avatar);
-            messageDiv.appendChild(content);
-            
-            this.messages.appendChild(messageDiv);
-            
-            // Smooth scroll to bottom
+            this.updateLoadEarlier();
+        }
+
+        updateLoadEarlier() {
+            if (this.firstRendered > 0 && !this.loadEarlierButton) {
+                const button = document.createElement("button");
+                button.className = "ai-chatbot-load-earlier";
+                button.textContent = "Show earlier messages";
+                this.messages.prepend(button);
+                this.loadEarlierButton = button;
+            }
+            if (this.loadEarlierButton) {
+                this.loadEarlierButton.hidden = this.firstRendered === 0;
+            }
+        }
+
+        loadEarlier() {
+            const start = Math.max(0, this.firstRendered - MAX_RENDERED_MESSAGES);
+            const fragment = document.createDocumentFragment();
+            for (let i = start; i < this.firstRendered; i++) {
+                fragment.appendChild(this.buildMessage(this.history[i]));
+            }
+            // Keep the visible messages in place while older ones go in above them
+            const fromBottom = this.messages.scrollHeight - this.messages.scrollTop;
+            this.history[this.firstRendered].node.before(fragment);
+            this.messages.scrollTop = this.messages.scrollHeight - fromBottom;
+            this.firstRendered = start;
+            this.updateLoadEarlier();
+        }
+
+        scrollToBottom(behavior = 'smooth', force = false) {
+            // Leave the view alone while the reader is scrolled up in the history
+            if (!force && !this._pinned) return;
+            // Stays pinned while a smooth scroll is still travelling to the anchor
+            this._pinned = true;
+            // Scroll to the anchor without reading scrollHeight; one scroll per frame,
+            // using the behavior of the latest request
+            this._scrollBehavior = behavior;
+            if (this._scrollPending) return;
+            this._scrollPending = true;
             requestAnimationFrame(() => {
-                this.messages.scrollTo({
-                    top: this.messages.scrollHeight,
-                    behavior: 'smooth'
-                });
+                this._scrollPending = false;
+                this.scrollAnchor.scrollIntoView({ block: 'end', behavior: this._scrollBehavior });
             });
         }
 
         showTyping() {
-            const typingId = `typing-${Date.now()}`;
-            const typingDiv = document.createElement("div");
-            typingDiv.id = typingId;
-            typingDiv.className = "ai-chatbot-message ai-chatbot-message-bot";
-            typingDiv.innerHTML = `
-                <div class="ai-chatbot-message-avatar">AI</div>
-                <div class="ai-chatbot-message-content">
-                    <div class="ai-chatbot-typing">
-                        <span></span>
-                        <span></span>
-                        <span></span>
-                    </div>
-                </div>
-            `;
+            // One typing node, built on first use and moved in and out of the list
+            if (!this.typingNode) {
+                this.typingNode = document.createElement("div");
+                this.typingNode.className = "ai-chatbot-message ai-chatbot-message-bot";
+                this.typingNode.appendChild(this.typingTpl.cloneNode(true));
+            }
+            // Cancel a fade-out still pending from the previous reply
+            clearTimeout(this._typingRemoval);
+            this.typingNode.style.opacity = '';
             
-            this.messages.appendChild(typingDiv);
-            this.messages.scrollTop = this.messages.scrollHeight;
+            this.messages.insertBefore(this.typingNode, this.scrollAnchor);
+            // Instant - the reply that follows does the smooth scroll
+            this.scrollToBottom('auto');
             
-            return typingId;
+            return this.typingNode;
         }
 
-        removeTyping(typingId) {
-            const typingDiv = document.getElementById(typingId);
-            if (typingDiv) {
+        removeTyping(typingDiv) {
+            if (typingDiv && typingDiv.isConnected) {
                 typingDiv.style.opacity = '0';
-                setTimeout(() => typingDiv.remove(), 200);
+                clearTimeout(this._typingRemoval);
+                this._typingRemoval = setTimeout(() => typingDiv.remove(), 200);
             }
         }
 
@@ -2455,29 +3432,128 @@ async def serve_widget():
         }
     }
 
-    // Initialize chatbot
-    const chatbot = new AIChatbot();
+    // Mount lazily so the widget's DOM and CSS parse stay off the host page's load path
+    let chatbot = null;
+    function getChatbot() {
+        if (!chatbot) {
+            mountWidget();
+            chatbot = new AIChatbot();
+        }
+        return chatbot;
+    }
+
+    if ("requestIdleCallback" in window) {
+        requestIdleCallback(getChatbot, { timeout: 3000 });
+    } else {
+        setTimeout(getChatbot, 1);
+    }
 
-    // Expose API for external control
+    // Expose API for external control; calling it before idle mounts immediately
     window.AIChatbot = {
-        open: () => chatbot.open(),
-        close: () => chatbot.close(),
-        toggle: () => chatbot.toggle(),
-        minimize: () => chatbot.minimize(),
-        sendMessage: () => chatbot.sendMessage()
+        open: () => getChatbot().open(),
+        close: () => getChatbot().close(),
+        toggle: () => getChatbot().toggle(),
+        minimize: () => getChatbot().minimize(),
+        sendMessage: () => getChatbot().sendMessage()
     };
 
     // Auto-open on mobile after delay
     if (window.innerWidth < 768 && config.autoStart) {
         setTimeout(() => {
             if (!isOpen) {
-                chatbot.open();
+                getChatbot().open();
             }
         }, 5000);
     }
 })();"""
+_WIDGET_BYTES = minify_source(WIDGET_JS).encode("utf-8")
+_WIDGET_GZIP = gzip.compress(_WIDGET_BYTES, compresslevel=9)
+_WIDGET_BR = brotli.compress(_WIDGET_BYTES, quality=11)
+_WIDGET_TAG = hashlib.blake2b(_WIDGET_BYTES, digest_size=8).hexdigest()
+
+
+def _widget_variant(body: bytes, encoding: str, suffix: str) -> Tuple[bytes, Dict]:
+    # Each encoding is a different byte stream, so each gets its own strong ETag
+    headers = {
+        "Cache-Control": "public, max-age=86400",
+        "ETag": f'"{_WIDGET_TAG}{suffix}"',
+        "Vary": "Accept-Encoding",
+    }
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return body, headers
 
-    return Response(content=widget_content, media_type="application/javascript")
+
+# In order of preference when the client weighs them equally
+_WIDGET_VARIANTS = {
+    "br": _widget_variant(_WIDGET_BR, "br", "-br"),
+    "gzip": _widget_variant(_WIDGET_GZIP, "gzip", "-gz"),
+    "identity": _widget_variant(_WIDGET_BYTES, "identity", ""),
+}
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """Best widget encoding for an Accept-Encoding header, honouring q-values"""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    def weight(coding: str) -> float:
+        if coding in weights:
+            return weights[coding]
+        if coding == "identity":
+            # identity is acceptable unless explicitly refused
+            return weights.get("*", 1.0)
+        return weights.get("*", 0.0)
+
+    best = max(_WIDGET_VARIANTS, key=weight)
+    return best if weight(best) > 0 else "identity"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match list, as GET revalidation uses"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+@app.get("/widget/widget.js")
+async def serve_widget(request: Request):
+    """Serve the improved widget directly"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    body, headers = _WIDGET_VARIANTS[encoding]
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        # A 304 carries no body, so it also drops Content-Encoding
+        return Response(
+            status_code=304,
+            headers={k: v for k, v in headers.items() if k != "Content-Encoding"},
+        )
+
+    return Response(
+        content=body,
+        media_type="application/javascript",
+        headers=headers,
+    )
 
 
 if __name__ == "__main__":
@@ -2497,4 +3573,15 @@ if __name__ == "__main__":
     os.makedirs("./chroma_db", exist_ok=True)
     os.makedirs("./models", exist_ok=True)
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # uvloop/httptools come with uvicorn[standard]; uvloop has no Windows build
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # Widget clients send bursts of chat requests; keep their
+        # connections open between them
+        timeout_keep_alive=30,
+    )
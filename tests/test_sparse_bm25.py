@@ -0,0 +1,110 @@
+"""
+SparseBM25 must score exactly like rank_bm25's BM25Okapi, which it replaced
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+retrieval_optimizer = pytest.importorskip("backend.chatbot.retrieval_optimizer")
+SparseBM25 = retrieval_optimizer.SparseBM25
+
+# "the" is in every document and "store" in most, so both get a negative raw
+# IDF and fall back to the epsilon floor
+CORPUS = [
+    "The store opens at nine",
+    "the store closes at five on Friday",
+    "Returns are accepted within thirty days at the store",
+    "the shipping is free on orders over fifty dollars",
+    "the gift cards never expire",
+]
+
+
+def rank_bm25_scores(documents, query, k1=1.5, b=0.75, epsilon=0.25):
+    """BM25Okapi.get_scores from rank_bm25 0.2.2, written out in plain Python"""
+    corpus = [doc.lower().split() for doc in documents]
+    doc_freqs = [{w: doc.count(w) for w in doc} for doc in corpus]
+    doc_len = [len(doc) for doc in corpus]
+    avgdl = sum(doc_len) / len(corpus)
+
+    nd = {}
+    for freqs in doc_freqs:
+        for word in freqs:
+            nd[word] = nd.get(word, 0) + 1
+    idf = {
+        word: math.log(len(corpus) - freq + 0.5) - math.log(freq + 0.5)
+        for word, freq in nd.items()
+    }
+    eps = epsilon * sum(idf.values()) / len(idf)
+    idf = {word: eps if value < 0 else value for word, value in idf.items()}
+
+    scores = [0.0] * len(corpus)
+    for q in query:
+        for i, freqs in enumerate(doc_freqs):
+            f = freqs.get(q, 0)
+            norm = k1 * (1 - b + b * doc_len[i] / avgdl)
+            scores[i] += idf.get(q, 0) * f * (k1 + 1) / (f + norm)
+    return scores
+
+
+def dense_scores(index, query):
+    """Expand search()'s (docs, scores) pair to one score per document"""
+    docs, scores = index.search(query)
+    dense = np.zeros(len(CORPUS))
+    dense[docs] = scores
+    return dense
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SparseBM25(CORPUS)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        ["store", "hours"],
+        ["returns", "thirty", "days"],
+        ["gift", "cards"],
+        # Below-zero raw IDF: scored with the epsilon floor
+        ["the"],
+        ["the", "store"],
+        # Repeated terms count once per occurrence
+        ["store", "store", "friday"],
+        ["the", "the", "shipping", "shipping", "shipping"],
+    ],
+)
+def test_scores_match_rank_bm25(index, query):
+    expected = rank_bm25_scores(CORPUS, query)
+    np.testing.assert_allclose(dense_scores(index, query), expected, rtol=1e-5)
+
+
+def test_negative_idf_is_floored_above_zero(index):
+    docs, scores = index.search(["the"])
+    assert sorted(docs.tolist()) == list(range(len(CORPUS)))
+    assert (scores > 0).all()
+
+
+def test_repeated_term_doubles_score(index):
+    once = dense_scores(index, ["friday"])
+    twice = dense_scores(index, ["friday", "friday"])
+    np.testing.assert_allclose(twice, 2 * once, rtol=1e-6)
+
+
+def test_out_of_vocabulary_query_matches_nothing(index):
+    docs, scores = index.search(["refund", "warranty"])
+    assert docs.size == 0
+    assert scores.size == 0
+
+
+def test_out_of_vocabulary_terms_are_ignored(index):
+    np.testing.assert_allclose(
+        dense_scores(index, ["gift", "warranty"]),
+        rank_bm25_scores(CORPUS, ["gift", "warranty"]),
+        rtol=1e-5,
+    )